@@ -5,10 +5,23 @@ from typing import List
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
+    # Storage Backend
+    storage_backend: str = "mongo"  # "mongo" or "sqlite" (local stand-in, no Atlas needed)
+    sqlite_path: str = "tool_parts_finder.db"  # ":memory:" keeps nothing on disk
+
     # MongoDB Configuration
-    mongodb_uri: str
+    mongodb_uri: str = ""  # Required when storage_backend is "mongo"
     database_name: str = "tool_parts_finder"
 
+    # MongoDB Connection Pool
+    mongodb_min_pool_size: int = 5  # Opened eagerly at startup
+    mongodb_max_pool_size: int = 50  # Per worker process; size against the Atlas connection limit
+    mongodb_max_idle_time_ms: int = 300000
+    mongodb_server_selection_timeout_ms: int = 5000
+    mongodb_connect_timeout_ms: int = 10000
+    mongodb_socket_timeout_ms: int = 20000
+    mongodb_compressors: str = ""  # e.g. "zstd,snappy,zlib" (zstd/snappy need extra packages)
+
     # OpenAI Configuration (Phase 2+)
     openai_api_key: str = ""  # Optional for Phase 1
 
@@ -16,10 +29,55 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     cors_origins: str = "http://localhost:5173,http://localhost:3000"  # Railway env var format
+    workers: int = 1  # Server processes under gunicorn.conf.py; 0 = one per CPU core
+    index_reload_seconds: float = 60.0  # With several workers: reload catalog, equivalents and order ranking this often
 
     # Cache Configuration (Phase 2+)
     cache_expiry_days: int = 90
     search_history_limit: int = 50  # Phase 1: Keep last 50 searches
+    search_history_retention_days: int = 30  # Older history is removed by a TTL index
+
+    # Vendor Pricing Scraper
+    pricing_enabled: bool = False  # Scrape prices on /api/search (adds up to search_deadline_seconds)
+    pricing_max_connections: int = 50  # Shared keep-alive pool across all vendors
+    pricing_per_host_concurrency: int = 2
+    pricing_requests_per_second: float = 1.0  # Per vendor host
+    pricing_burst: int = 3
+    pricing_fresh_days: int = 7  # Older cached prices are served but refreshed in the background
+    pricing_cache_size: int = 2048  # In-process entries in front of the Mongo pricing cache
+
+    # Streamed Pricing Jobs
+    pricing_workers: int = 8
+    pricing_queue_size: int = 500  # Jobs beyond this are skipped (URL only, no pricing)
+    pricing_stream_ttl_seconds: int = 60  # Drop unread streams after this
+
+    # Vendor Pricing Fan-out
+    vendor_timeout_seconds: float = 8.0  # Give up on a single vendor's pricing after this
+    search_deadline_seconds: float = 2.5  # Return /api/search after this; slower vendors show "processing"
+
+    # Search History Writer
+    history_buffer_size: int = 5000  # Entries beyond this are dropped (and counted)
+    history_flush_size: int = 100
+    history_flush_interval_seconds: float = 1.0
+
+    # Equivalents Graph
+    equivalents_max_hops: int = 3  # Longest chain of equivalents followed
+    equivalents_min_confidence: float = 0.3  # Chains below this are not returned
+    equivalents_cache_size: int = 1024
+
+    # Order-pattern Vendor Ranking
+    order_ranking_refresh_seconds: float = 30.0  # New orders affect ranking after at most this
+
+    # Conditional GET Response Cache
+    response_cache_size: int = 256  # Serialized history/favorites pages kept per process
+
+    # Request Metrics (/metrics)
+    metrics_enabled: bool = True
+    metrics_sample_rate: float = 1.0  # Share of requests timed; every request is still counted
+
+    # Query Parser Cache
+    parser_cache_size: int = 1024  # 0 disables the cache
+    parser_cache_ttl_seconds: int = 3600
 
     class Config:
         env_file = ".env"
@@ -27,3 +85,8 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+# Worker processes actually serving the app. gunicorn.conf.py sets this to
+# the count it resolved from WORKERS; run any other way (uvicorn, main.py,
+# benchmarks) the app is one process, whatever WORKERS says.
+server_workers = 1
@@ -1,22 +1,169 @@
+import asyncio
+import threading
+import time
+from typing import Dict
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+from pymongo.monitoring import ConnectionPoolListener
 from app.config import settings
 
+# Server error code when an index exists with different options
+INDEX_OPTIONS_CONFLICT = 85
+
+
+class PoolStats(ConnectionPoolListener):
+    """Connection pool counters, fed by the driver's pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Events arrive from driver threads
+        self.open = 0
+        self.in_use = 0
+        self.created = 0
+        self.checkout_failures = 0
+
+    def _add(self, field: str, amount: int) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def connection_created(self, event):
+        self._add("open", 1)
+        self._add("created", 1)
+
+    def connection_closed(self, event):
+        self._add("open", -1)
+
+    def connection_checked_out(self, event):
+        self._add("in_use", 1)
+
+    def connection_checked_in(self, event):
+        self._add("in_use", -1)
+
+    def connection_check_out_failed(self, event):
+        self._add("checkout_failures", 1)
+
+    # Remaining pool events aren't needed for the counters
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "open": self.open,
+                "in_use": self.in_use,
+                "min_size": settings.mongodb_min_pool_size,
+                "max_size": settings.mongodb_max_pool_size,
+                "utilization": round(self.in_use / settings.mongodb_max_pool_size, 3),
+                "created_total": self.created,
+                "checkout_failures": self.checkout_failures,
+            }
+
 
 class MongoDB:
     """MongoDB connection manager."""
 
     client: AsyncIOMotorClient = None
     database: AsyncIOMotorDatabase = None
+    pool_stats: PoolStats = None
 
 
 mongodb = MongoDB()
 
 
 async def connect_to_mongodb():
-    """Connect to MongoDB Atlas."""
-    mongodb.client = AsyncIOMotorClient(settings.mongodb_uri)
+    """Connect to MongoDB Atlas with a Settings-sized pool, then warm it up."""
+    if not settings.mongodb_uri:
+        raise RuntimeError("MONGODB_URI is required for the mongo storage backend (or set STORAGE_BACKEND=sqlite)")
+
+    mongodb.pool_stats = PoolStats()
+    mongodb.client = AsyncIOMotorClient(
+        settings.mongodb_uri,
+        minPoolSize=settings.mongodb_min_pool_size,
+        maxPoolSize=settings.mongodb_max_pool_size,
+        maxIdleTimeMS=settings.mongodb_max_idle_time_ms,
+        serverSelectionTimeoutMS=settings.mongodb_server_selection_timeout_ms,
+        connectTimeoutMS=settings.mongodb_connect_timeout_ms,
+        socketTimeoutMS=settings.mongodb_socket_timeout_ms,
+        event_listeners=[mongodb.pool_stats],
+        **({"compressors": settings.mongodb_compressors} if settings.mongodb_compressors else {})
+    )
     mongodb.database = mongodb.client[settings.database_name]
-    print(f"✅ Connected to MongoDB: {settings.database_name}")
+
+    try:
+        latency_ms = await warm_up_pool()
+        print(f"✅ Connected to MongoDB: {settings.database_name} ({latency_ms:.1f} ms ping)")
+    except Exception as e:
+        print(f"⚠️ MongoDB not reachable at startup: {e}")
+        return
+
+    try:
+        await create_indexes(mongodb.database)
+    except Exception as e:
+        print(f"⚠️ Could not create MongoDB indexes: {e}")
+
+
+async def create_indexes(db: AsyncIOMotorDatabase):
+    """
+    Create indexes (idempotent; safe to run on every startup).
+
+    Each index is attempted separately so one failure (e.g. duplicate
+    favorites blocking the unique index) doesn't skip the rest.
+    """
+    indexes = [
+        # Pricing cache: one entry per (vendor, query)
+        (db.pricing_cache, [("vendor", ASCENDING), ("query", ASCENDING)], {"unique": True}),
+        # Keyset pagination sorts by (timestamp|last_ordered, _id), newest first
+        (db.search_history, [("timestamp", DESCENDING), ("_id", DESCENDING)], {}),
+        (db.favorites, [("last_ordered", DESCENDING), ("_id", DESCENDING)], {}),
+        # create_favorite looks up by search_query
+        (db.favorites, [("search_query", ASCENDING)], {"unique": True}),
+    ]
+    for collection, keys, options in indexes:
+        try:
+            await collection.create_index(keys, **options)
+        except Exception as e:
+            print(f"⚠️ Could not create index {keys} on {collection.name}: {e}")
+
+    # Expiring collections keep search_history bounded
+    ttl_indexes = [
+        (db.pricing_cache, "fetched_at", settings.cache_expiry_days),
+        (db.search_history, "timestamp", settings.search_history_retention_days),
+    ]
+    for collection, field, days in ttl_indexes:
+        try:
+            await _ensure_ttl_index(db, collection, field, days * 86400)
+        except Exception as e:
+            print(f"⚠️ Could not create TTL index on {collection.name}.{field}: {e}")
+
+
+async def _ensure_ttl_index(db: AsyncIOMotorDatabase, collection, field: str, seconds: int):
+    """Create a TTL index, or update its expiry if the setting changed."""
+    try:
+        await collection.create_index(field, expireAfterSeconds=seconds)
+    except OperationFailure as e:
+        if e.code != INDEX_OPTIONS_CONFLICT:
+            raise
+        await db.command(
+            "collMod",
+            collection.name,
+            index={"keyPattern": {field: 1}, "expireAfterSeconds": seconds}
+        )
 
 
 async def close_mongodb_connection():
@@ -26,6 +173,44 @@ async def close_mongodb_connection():
         print("🔌 MongoDB connection closed")
 
 
+async def ping_database() -> float:
+    """Round-trip a ping to the server; returns latency in milliseconds."""
+    started = time.perf_counter()
+    await mongodb.client.admin.command("ping")
+    return (time.perf_counter() - started) * 1000
+
+
+async def warm_up_pool() -> float:
+    """
+    Ping once to select a server, then open min_pool_size connections at
+    once so the first requests don't pay for connection setup (TLS + auth
+    on Atlas). Returns the first ping's latency in milliseconds.
+    """
+    latency_ms = await ping_database()
+    if settings.mongodb_min_pool_size > 1:
+        await asyncio.gather(*[
+            mongodb.client.admin.command("ping")
+            for _ in range(settings.mongodb_min_pool_size)
+        ])
+    return latency_ms
+
+
+async def database_health() -> Dict[str, object]:
+    """Live database status for /health: ping latency and pool usage."""
+    if mongodb.client is None:
+        return {"status": "disconnected"}
+
+    try:
+        latency_ms = await asyncio.wait_for(
+            ping_database(),
+            timeout=settings.mongodb_server_selection_timeout_ms / 1000
+        )
+    except Exception as e:
+        return {"status": "unreachable", "error": str(e) or type(e).__name__, "pool": mongodb.pool_stats.snapshot()}
+
+    return {"status": "connected", "latency_ms": round(latency_ms, 2), "pool": mongodb.pool_stats.snapshot()}
+
+
 def get_database() -> AsyncIOMotorDatabase:
     """Get database instance."""
     return mongodb.database
@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+
+
+def encode_cursor(value: Optional[datetime], doc_id: ObjectId) -> str:
+    """Opaque cursor for the last item of a page, sorted by (value, _id)."""
+    payload = [value.isoformat() if value is not None else None, str(doc_id)]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        value, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (datetime.fromisoformat(value) if value is not None else None, ObjectId(doc_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def projection_for(fields: Optional[str], allowed: Iterable[str], required: List[str]) -> Optional[List[str]]:
+    """
+    Turn a `fields=a,b` query parameter into the list of fields to return.
+
+    `required` fields (the sort key) are always included so the next cursor
+    can be built. Returns None when no fields were requested. Raises
+    ValueError for fields the model doesn't have.
+    """
+    if not fields:
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    return [*requested, *required]
@@ -1,27 +1,85 @@
+import asyncio
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from app import config
 from app.config import settings
-from app.database.mongodb import connect_to_mongodb, close_mongodb_connection
-from app.routers import search, history, favorites
+from app.middleware.timing import TimingMiddleware
+from app.responses import FastJSONResponse
+from app.repositories.storage import connect_storage, close_storage, get_storage
+from app.services.pricing import pricing_engine
+from app.services.pricing_jobs import pricing_jobs
+from app.services.history_writer import history_writer
+from app.services.catalog import catalog_index
+from app.services.equivalents import equivalents_graph
+from app.services.order_ranking import order_ranking
+from app.services import metrics
+from app.routers import search, history, favorites, catalog, equivalents, orders, vendors
+
+
+async def load_indexes():
+    """Build the in-memory catalog index and equivalents graph from storage."""
+    try:
+        loaded = await catalog_index.load(get_storage().catalog)
+        print(f"✅ Indexed {catalog_index.stats()['part_numbers']} part numbers from {loaded} catalogs")
+    except Exception as e:
+        print(f"⚠️ Parts catalog not loaded: {e}")
+
+    try:
+        loaded = await equivalents_graph.load(get_storage().equivalents)
+        print(f"✅ Loaded {equivalents_graph.stats()['links']} equivalents from {loaded} maps")
+    except Exception as e:
+        print(f"⚠️ Equivalents not loaded: {e}")
+
+
+async def reload_indexes():
+    """
+    With several workers (see gunicorn.conf.py), each has its own catalog
+    index, equivalents graph and order ranking; reload them now and then so
+    imports and orders made through other workers show up here too.
+    """
+    while True:
+        await asyncio.sleep(settings.index_reload_seconds)
+        storage = get_storage()
+        try:
+            await catalog_index.reload(storage.catalog)
+            await equivalents_graph.reload(storage.equivalents)
+            await order_ranking.reload(storage)
+        except Exception as e:
+            print(f"⚠️ Index reload failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup and shutdown events."""
+    """Startup and shutdown events (run by every worker)."""
     # Startup
-    await connect_to_mongodb()
+    await connect_storage()
+    await load_indexes()
+    await order_ranking.start(get_storage())
+    await history_writer.start()
+    await pricing_jobs.start()
+    reloader = asyncio.create_task(reload_indexes()) if config.server_workers > 1 else None
     yield
     # Shutdown
-    await close_mongodb_connection()
+    if reloader is not None:
+        reloader.cancel()
+        await asyncio.gather(reloader, return_exceptions=True)
+    await pricing_jobs.stop()
+    await order_ranking.stop()
+    await pricing_engine.close()
+    await history_writer.stop()
+    await close_storage()
 
 
 app = FastAPI(
     title="Tool Parts Finder API",
     description="AI-powered multi-vendor tool parts search for pneumatic tool repair",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -43,10 +101,17 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Request counts and latency histograms, served at /metrics
+app.add_middleware(TimingMiddleware)
+
 # Include routers
 app.include_router(search.router)
 app.include_router(history.router)
 app.include_router(favorites.router)
+app.include_router(catalog.router)
+app.include_router(equivalents.router)
+app.include_router(orders.router)
+app.include_router(vendors.router)
 
 
 @app.get("/")
@@ -61,15 +126,35 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Detailed health check."""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "api_version": "1.0.0"
-    }
+    """
+    Detailed health check.
+
+    Pings the storage backend (for Mongo: round-trip latency and connection
+    pool usage). Returns 503 if it can't be reached.
+    """
+    database = await get_storage().health()
+    healthy = database["status"] == "connected"
+
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "degraded",
+            "database": database,
+            "api_version": "1.0.0",
+            "history_writer": history_writer.stats()
+        }
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Request, search-stage and vendor latency metrics in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
+    # Development server (one process, auto-reload); production runs
+    # several workers with: gunicorn -c gunicorn.conf.py app.main:app
     import uvicorn
     uvicorn.run(
         "main:app",
@@ -0,0 +1,58 @@
+import time
+from typing import Any, Callable, Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.services import metrics
+
+
+class TimingMiddleware:
+    """
+    Count every request and time the sampled ones, per route.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so streamed responses pass
+    straight through and are timed to their last byte. Routes are labelled
+    by their path template ("/api/favorites/{favorite_id}"), not the raw
+    path, so ids don't create a series each.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_paths: Optional[Dict[Callable[..., Any], str]] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timed = metrics.start_request()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self._route(scope)
+            metrics.REQUESTS.inc((("method", scope["method"]), ("route", route), ("status", str(status))))
+            if timed:
+                metrics.REQUEST_SECONDS.observe(
+                    time.perf_counter() - started,
+                    (("method", scope["method"]), ("route", route))
+                )
+
+    def _route(self, scope: Scope) -> str:
+        """Path template of the route that handled the request (the router records its endpoint)."""
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(scope.get("endpoint"), "unmatched")
@@ -1,11 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from bson import ObjectId
 
 
 class PyObjectId(ObjectId):
-    """Custom ObjectId type for Pydantic v2."""
+    """Custom ObjectId type for Pydantic v2: validated from str, dumped as str in JSON."""
 
     @classmethod
     def __get_pydantic_core_schema__(cls, source_type, handler):
@@ -18,13 +18,21 @@ class PyObjectId(ObjectId):
                 return ObjectId(value)
             raise ValueError(f"Invalid ObjectId: {value}")
 
-        return core_schema.union_schema([
-            core_schema.is_instance_schema(ObjectId),
-            core_schema.no_info_after_validator_function(
-                validate_from_any,
-                core_schema.str_schema(),
-            ),
-        ])
+        from_str = core_schema.no_info_after_validator_function(
+            validate_from_any,
+            core_schema.str_schema(),
+        )
+
+        return core_schema.json_or_python_schema(
+            # JSON (model_validate_json, e.g. NDJSON imports) can only hold a string
+            json_schema=from_str,
+            python_schema=core_schema.union_schema([
+                core_schema.is_instance_schema(ObjectId),
+                from_str,
+            ]),
+            # Python dumps keep the ObjectId for the database
+            serialization=core_schema.plain_serializer_function_ser_schema(str, when_used="json"),
+        )
 
     @classmethod
     def __get_pydantic_json_schema__(cls, field_schema, handler):
@@ -40,6 +48,9 @@ class ParsedQuery(BaseModel):
     part: Optional[str] = None
     raw_query: str
 
+    # QueryParser.parse hands out cached instances
+    model_config = ConfigDict(frozen=True)
+
 
 class VendorResult(BaseModel):
     """Search result from a single vendor."""
@@ -52,29 +63,62 @@ class VendorResult(BaseModel):
     logo_url: Optional[str] = None
 
 
+class CatalogMatch(BaseModel):
+    """A known part from the local parts catalog."""
+    brand: Optional[str] = None
+    model: Optional[str] = None
+    callout: str
+    description: str
+    part_number: str
+
+
+class EquivalentMatch(BaseModel):
+    """A part that fits in place of another, possibly through other equivalents."""
+    brand: str
+    part_number: str
+    confidence: float  # Product of the confidences along the chain
+    hops: int  # 1 for a direct equivalent
+    source: str  # Of the last link: "ai_generated" or "user_confirmed"
+    order_count: int = 0  # Of the last link
+
+
+class VendorInfo(BaseModel):
+    """A vendor that can be searched."""
+    key: str  # What SearchRequest.vendors takes
+    name: str
+    logo_url: Optional[str] = None
+    pricing: bool  # Scraped for prices, not just linked
+    default: bool  # Searched when the request doesn't list vendors
+
+
+# Default vendor order for searches
+DEFAULT_VENDORS = [
+    # Search Engines
+    "google",
+    "google_shopping",
+    "bing_shopping",
+    "duckduckgo",
+    # National Marketplaces
+    "ebay",
+    "amazon",
+    # Local BC/Surrey Stores
+    "kms_tools",
+    # Major Retailers
+    "canadian_tire",
+    "home_depot",
+    # Pneumatic Specialists
+    "contractor_cave",
+    "canada_tool_parts",
+    # Repair Videos
+    "youtube",  # Last - for learning how to install/repair
+]
+
+
 class SearchRequest(BaseModel):
     """Request to search across vendors."""
     query: str
-    vendors: List[str] = [
-        # Search Engines
-        "google",
-        "google_shopping",
-        "bing_shopping",
-        "duckduckgo",
-        # National Marketplaces
-        "ebay",
-        "amazon",
-        # Local BC/Surrey Stores
-        "kms_tools",
-        # Major Retailers
-        "canadian_tire",
-        "home_depot",
-        # Pneumatic Specialists
-        "contractor_cave",
-        "canada_tool_parts",
-        # Repair Videos
-        "youtube",  # Last - for learning how to install/repair
-    ]
+    vendors: List[str] = DEFAULT_VENDORS
+    stream: bool = False  # Return URLs now, stream pricing from /api/search/{search_id}/stream
 
 
 class SearchResponse(BaseModel):
@@ -82,6 +126,31 @@ class SearchResponse(BaseModel):
     parsed: ParsedQuery
     results: List[VendorResult]
     ai_suggestions: Optional[Dict[str, Any]] = None
+    search_id: Optional[str] = None  # Set when pricing updates are being streamed
+    catalog_matches: List[CatalogMatch] = []  # Known parts from the local catalog
+    equivalents: List[EquivalentMatch] = []  # Cross-brand equivalents of the part searched for
+
+
+class BatchSearchRequest(BaseModel):
+    """Request to search a whole parts list (one query per line)."""
+    queries: List[str] = Field(max_length=500)
+    vendors: List[str] = DEFAULT_VENDORS
+
+
+class BatchSearchItem(BaseModel):
+    """Result for one line of a batch search."""
+    query: str
+    parsed: Optional[ParsedQuery] = None
+    results: List[VendorResult] = []
+    catalog_matches: List[CatalogMatch] = []
+    error: Optional[str] = None
+
+
+class BatchSearchResponse(BaseModel):
+    """Batch search results, in the same order as the request."""
+    items: List[BatchSearchItem]
+    total: int
+    failed: int
 
 
 # ========== Search History Models ==========
@@ -96,16 +165,14 @@ class SearchHistory(BaseModel):
     marked_ordered: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str, datetime: lambda v: v.isoformat()}
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
 
 class SearchHistoryResponse(BaseModel):
     """Response containing search history."""
     history: List[SearchHistory]
     total: int
+    next_cursor: Optional[str] = None  # Pass as ?after= for the next page
 
 
 # ========== Favorites Models ==========
@@ -120,10 +187,7 @@ class Favorite(BaseModel):
     preferred_vendor: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str, datetime: lambda v: v.isoformat()}
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
 
 class FavoriteCreate(BaseModel):
@@ -143,6 +207,7 @@ class FavoriteResponse(BaseModel):
     """Response containing favorites."""
     favorites: List[Favorite]
     total: int
+    next_cursor: Optional[str] = None  # Pass as ?after= for the next page
 
 
 # ========== Parts Catalog Models ==========
@@ -154,6 +219,24 @@ class PartDetail(BaseModel):
     part_number: Optional[str] = None
 
 
+class BulkImportResponse(BaseModel):
+    """Result of an NDJSON history or favorites import."""
+    received: int  # Non-blank lines
+    inserted: int
+    updated: int  # Favorites whose search_query already existed
+    skipped: int  # Valid, but their _id was already taken
+    invalid: int
+    errors: List[str] = []  # The first few invalid lines and why
+
+
+class CatalogImportResponse(BaseModel):
+    """Result of importing a parts list into the catalog."""
+    catalogs: int  # One per (brand, model) in the file
+    parts: int
+    skipped: int  # Rows without a part number or description
+    indexed: int  # Distinct part numbers in the index afterwards
+
+
 class PartsCatalog(BaseModel):
     """Cached PDF catalog data."""
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
@@ -164,10 +247,7 @@ class PartsCatalog(BaseModel):
     extracted_at: datetime = Field(default_factory=datetime.utcnow)
     expiry: datetime
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str, datetime: lambda v: v.isoformat()}
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
 
 # ========== Equivalents Models ==========
@@ -181,6 +261,14 @@ class EquivalentPart(BaseModel):
     order_count: int = 0
 
 
+class EquivalentOrder(BaseModel):
+    """An equivalent that was ordered and fit (part -> equivalent part)."""
+    brand: str
+    part_number: str
+    equivalent_brand: str
+    equivalent_part_number: str
+
+
 class EquivalentsMap(BaseModel):
     """Cross-brand equivalents mapping."""
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
@@ -188,10 +276,7 @@ class EquivalentsMap(BaseModel):
     equivalents: List[EquivalentPart] = []
     learning_data: Dict[str, Any] = {}
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
 
 # ========== Order Pattern Models ==========
@@ -209,11 +294,23 @@ class OrderPattern(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     part_query: str
     ordered_from: str
+    part_ordered: Optional[str] = None
     price_paid: Optional[float] = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     equivalent_used: bool = False
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str, datetime: lambda v: v.isoformat()}
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+
+class VendorOrderStats(BaseModel):
+    """How often a vendor was ordered from for a part or brand."""
+    vendor: str
+    orders: int
+    median_price: Optional[float] = None
+
+
+class OrderSummary(BaseModel):
+    """Order history behind the vendor ranking for a query."""
+    query: str
+    scope: Optional[str] = None  # "part", "brand" or "all": the most specific one with orders
+    vendors: List[VendorOrderStats] = []
@@ -0,0 +1,167 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+
+# Keyset position: (sort value of the last item seen, its _id)
+Cursor = Tuple[Optional[datetime], ObjectId]
+Document = Dict[str, Any]
+
+
+class HistoryRepository(ABC):
+    """Search history, newest first by (timestamp, _id)."""
+
+    @abstractmethod
+    async def add_many(self, documents: List[Document]) -> List[Document]:
+        """
+        Insert entries (unordered; a bad entry doesn't block the rest).
+
+        Returns the entries that weren't written and may be retried. Entries
+        whose _id is already stored (written by an earlier, partly failed
+        attempt) count as written.
+        """
+
+    @abstractmethod
+    async def list(
+        self,
+        limit: int,
+        after: Optional[Cursor] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Document]:
+        """A page of entries after `after`; `fields` limits the keys returned (plus _id)."""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Approximate number of entries (cheap, no scan)."""
+
+    @abstractmethod
+    async def clear(self) -> int:
+        """Delete every entry; returns how many were deleted."""
+
+    @abstractmethod
+    def export(self) -> AsyncIterator[Document]:
+        """Every entry in _id order, streamed from the database a batch at a time."""
+
+    @abstractmethod
+    async def import_many(self, documents: List[Document]) -> int:
+        """Insert entries keeping their _id (unordered; ones already present are skipped). Returns how many were new."""
+
+
+class FavoritesRepository(ABC):
+    """Favorite parts, unique by search_query, listed by (last_ordered, _id) newest first."""
+
+    @abstractmethod
+    async def list(
+        self,
+        limit: int,
+        after: Optional[Cursor] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Document]:
+        """A page of favorites after `after`; never-ordered favorites come last."""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Approximate number of favorites (cheap, no scan)."""
+
+    @abstractmethod
+    async def get_or_create(self, document: Document) -> Document:
+        """Insert the favorite unless one with its search_query exists; return the stored one."""
+
+    @abstractmethod
+    async def get(self, favorite_id: ObjectId) -> Optional[Document]:
+        """The favorite, or None if missing."""
+
+    @abstractmethod
+    async def update(self, favorite_id: ObjectId, fields: Document) -> Optional[Document]:
+        """Set fields on a favorite; returns the updated favorite or None if missing."""
+
+    @abstractmethod
+    async def increment_orders(self, favorite_id: ObjectId, ordered_at: datetime) -> Optional[Document]:
+        """Add one to times_ordered and set last_ordered; None if missing."""
+
+    @abstractmethod
+    async def delete(self, favorite_id: ObjectId) -> bool:
+        """Delete a favorite; False if it didn't exist."""
+
+    @abstractmethod
+    def export(self) -> AsyncIterator[Document]:
+        """Every favorite in _id order, streamed from the database a batch at a time."""
+
+    @abstractmethod
+    async def upsert_many(self, documents: List[Document]) -> Tuple[int, int]:
+        """
+        Insert or update favorites keyed on search_query (unordered). Existing
+        favorites keep their _id; new ones keep the imported _id. Returns
+        (inserted, updated).
+        """
+
+
+class PricingCacheRepository(ABC):
+    """Scraped pricing keyed by (vendor, normalized query)."""
+
+    @abstractmethod
+    async def get(self, vendor: str, query: str) -> Optional[Document]:
+        """The cached entry ({"pricing", "fetched_at"}) or None."""
+
+    @abstractmethod
+    async def put(
+        self,
+        vendor: str,
+        query: str,
+        pricing: Optional[Dict[str, float]],
+        fetched_at: datetime
+    ) -> None:
+        """Insert or replace the cached entry."""
+
+
+class DocumentRepository(ABC):
+    """Plain document store for the catalog, equivalents and order-pattern models."""
+
+    @abstractmethod
+    async def save(self, document: Document) -> ObjectId:
+        """Insert, or replace by _id; assigns an _id if missing and returns it."""
+
+    @abstractmethod
+    def all(self) -> AsyncIterator[Document]:
+        """Iterate every document without loading them all at once."""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Approximate number of documents."""
+
+
+class CatalogRepository(DocumentRepository):
+    """PartsCatalog documents."""
+
+
+class EquivalentsRepository(DocumentRepository):
+    """EquivalentsMap documents."""
+
+
+class OrderPatternRepository(DocumentRepository):
+    """OrderPattern documents."""
+
+
+class Storage(ABC):
+    """A storage backend: one repository per collection plus lifecycle hooks."""
+
+    history: HistoryRepository
+    favorites: FavoritesRepository
+    pricing_cache: PricingCacheRepository
+    catalog: CatalogRepository
+    equivalents: EquivalentsRepository
+    order_patterns: OrderPatternRepository
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Open connections and create indexes/tables."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release connections."""
+
+    @abstractmethod
+    async def health(self) -> Dict[str, Any]:
+        """Live status for /health; "status" is "connected" when usable."""
@@ -0,0 +1,243 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.database.mongodb import (
+    close_mongodb_connection,
+    connect_to_mongodb,
+    database_health,
+    get_database,
+)
+from app.repositories.base import (
+    CatalogRepository,
+    Cursor,
+    Document,
+    DocumentRepository,
+    EquivalentsRepository,
+    FavoritesRepository,
+    HistoryRepository,
+    OrderPatternRepository,
+    PricingCacheRepository,
+    Storage,
+)
+
+
+def _keyset_filter(field: str, after: Optional[Cursor]) -> Dict[str, Any]:
+    """
+    Filter for items after `after` in a (field DESC, _id DESC) sort.
+
+    Missing/null values sort after every date in descending order, so they
+    follow the dated items and are paged among themselves by _id.
+    """
+    if after is None:
+        return {}
+
+    value, doc_id = after
+    if value is None:
+        return {field: None, "_id": {"$lt": doc_id}}
+
+    return {"$or": [
+        {field: {"$lt": value}},
+        {field: value, "_id": {"$lt": doc_id}},
+        {field: None},
+    ]}
+
+
+def _projection(fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
+    return {field: 1 for field in fields} if fields else None
+
+
+# Server error code for a duplicate _id (or other unique key)
+DUPLICATE_KEY = 11000
+
+# Documents per round trip when streaming a whole collection out
+EXPORT_BATCH_SIZE = 1000
+
+
+async def _export(collection) -> AsyncIterator[Document]:
+    async for document in collection.find().sort("_id", 1).batch_size(EXPORT_BATCH_SIZE):
+        yield document
+
+
+class MongoHistoryRepository(HistoryRepository):
+
+    async def add_many(self, documents: List[Document]) -> List[Document]:
+        if not documents:
+            return []
+        try:
+            await get_database().search_history.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # insert_many has set every _id; those already stored are written
+            errors = e.details.get("writeErrors", [])
+            if not errors:
+                raise
+            return [documents[error["index"]] for error in errors if error["code"] != DUPLICATE_KEY]
+        return []
+
+    async def list(self, limit: int, after: Optional[Cursor] = None, fields: Optional[List[str]] = None) -> List[Document]:
+        cursor = (
+            get_database().search_history.find(_keyset_filter("timestamp", after), _projection(fields))
+            .sort([("timestamp", -1), ("_id", -1)])
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
+
+    async def count(self) -> int:
+        # Metadata count: O(1) instead of scanning the collection
+        return await get_database().search_history.estimated_document_count()
+
+    async def clear(self) -> int:
+        result = await get_database().search_history.delete_many({})
+        return result.deleted_count
+
+    def export(self) -> AsyncIterator[Document]:
+        return _export(get_database().search_history)
+
+    async def import_many(self, documents: List[Document]) -> int:
+        if not documents:
+            return 0
+        try:
+            result = await get_database().search_history.insert_many(documents, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Duplicate _ids (entries imported before) fail alone
+            return e.details["nInserted"]
+
+
+class MongoFavoritesRepository(FavoritesRepository):
+
+    async def list(self, limit: int, after: Optional[Cursor] = None, fields: Optional[List[str]] = None) -> List[Document]:
+        cursor = (
+            get_database().favorites.find(_keyset_filter("last_ordered", after), _projection(fields))
+            .sort([("last_ordered", -1), ("_id", -1)])
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
+
+    async def count(self) -> int:
+        return await get_database().favorites.estimated_document_count()
+
+    async def get_or_create(self, document: Document) -> Document:
+        # Insert unless it already exists, in one atomic round trip
+        # (search_query has a unique index)
+        return await get_database().favorites.find_one_and_update(
+            {"search_query": document["search_query"]},
+            {"$setOnInsert": document},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def get(self, favorite_id: ObjectId) -> Optional[Document]:
+        return await get_database().favorites.find_one({"_id": favorite_id})
+
+    async def update(self, favorite_id: ObjectId, fields: Document) -> Optional[Document]:
+        return await get_database().favorites.find_one_and_update(
+            {"_id": favorite_id},
+            {"$set": fields},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def increment_orders(self, favorite_id: ObjectId, ordered_at: datetime) -> Optional[Document]:
+        return await get_database().favorites.find_one_and_update(
+            {"_id": favorite_id},
+            {
+                "$inc": {"times_ordered": 1},
+                "$set": {"last_ordered": ordered_at}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def delete(self, favorite_id: ObjectId) -> bool:
+        result = await get_database().favorites.delete_one({"_id": favorite_id})
+        return result.deleted_count > 0
+
+    def export(self) -> AsyncIterator[Document]:
+        return _export(get_database().favorites)
+
+    async def upsert_many(self, documents: List[Document]) -> Tuple[int, int]:
+        if not documents:
+            return 0, 0
+
+        operations = []
+        for document in documents:
+            fields = {key: value for key, value in document.items() if key != "_id"}
+            update = {"$set": fields}
+            if "_id" in document:
+                update["$setOnInsert"] = {"_id": document["_id"]}
+            operations.append(UpdateOne({"search_query": document["search_query"]}, update, upsert=True))
+
+        try:
+            result = await get_database().favorites.bulk_write(operations, ordered=False)
+            return result.upserted_count, result.matched_count
+        except BulkWriteError as e:
+            # An imported _id taken by another favorite fails alone
+            return e.details["nUpserted"], e.details["nMatched"]
+
+
+class MongoPricingCacheRepository(PricingCacheRepository):
+
+    async def get(self, vendor: str, query: str) -> Optional[Document]:
+        return await get_database().pricing_cache.find_one({"vendor": vendor, "query": query})
+
+    async def put(self, vendor: str, query: str, pricing: Optional[Dict[str, float]], fetched_at: datetime) -> None:
+        await get_database().pricing_cache.update_one(
+            {"vendor": vendor, "query": query},
+            {"$set": {"pricing": pricing, "fetched_at": fetched_at}},
+            upsert=True
+        )
+
+
+class MongoDocumentRepository(DocumentRepository):
+    """Document store backed by one collection."""
+
+    collection_name: str
+
+    async def save(self, document: Document) -> ObjectId:
+        document.setdefault("_id", ObjectId())
+        await get_database()[self.collection_name].replace_one(
+            {"_id": document["_id"]}, document, upsert=True
+        )
+        return document["_id"]
+
+    async def all(self) -> AsyncIterator[Document]:
+        async for document in get_database()[self.collection_name].find():
+            yield document
+
+    async def count(self) -> int:
+        return await get_database()[self.collection_name].estimated_document_count()
+
+
+class MongoCatalogRepository(MongoDocumentRepository, CatalogRepository):
+    collection_name = "parts_catalog"
+
+
+class MongoEquivalentsRepository(MongoDocumentRepository, EquivalentsRepository):
+    collection_name = "equivalents"
+
+
+class MongoOrderPatternRepository(MongoDocumentRepository, OrderPatternRepository):
+    collection_name = "order_patterns"
+
+
+class MongoStorage(Storage):
+    """MongoDB (Atlas) backend; the default."""
+
+    def __init__(self):
+        self.history = MongoHistoryRepository()
+        self.favorites = MongoFavoritesRepository()
+        self.pricing_cache = MongoPricingCacheRepository()
+        self.catalog = MongoCatalogRepository()
+        self.equivalents = MongoEquivalentsRepository()
+        self.order_patterns = MongoOrderPatternRepository()
+
+    async def connect(self) -> None:
+        await connect_to_mongodb()
+
+    async def close(self) -> None:
+        await close_mongodb_connection()
+
+    async def health(self) -> Dict[str, Any]:
+        return {"backend": "mongo", **await database_health()}
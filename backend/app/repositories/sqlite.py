@@ -0,0 +1,370 @@
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import bson
+from bson import ObjectId
+
+from app.config import settings
+from app.repositories.base import (
+    CatalogRepository,
+    Cursor,
+    Document,
+    DocumentRepository,
+    EquivalentsRepository,
+    FavoritesRepository,
+    HistoryRepository,
+    OrderPatternRepository,
+    PricingCacheRepository,
+    Storage,
+)
+
+
+# Documents are stored as BSON blobs, so ObjectIds and datetimes round-trip
+# exactly as they do through Mongo (including millisecond precision).
+# Columns copied out of the document exist only for lookups and sorting.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_history (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT,
+    doc BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_history_timestamp ON search_history (timestamp DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS favorites (
+    id TEXT PRIMARY KEY,
+    search_query TEXT UNIQUE NOT NULL,
+    last_ordered TEXT,
+    doc BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS favorites_last_ordered ON favorites (last_ordered DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS pricing_cache (
+    vendor TEXT NOT NULL,
+    query TEXT NOT NULL,
+    doc BLOB NOT NULL,
+    PRIMARY KEY (vendor, query)
+);
+
+CREATE TABLE IF NOT EXISTS parts_catalog (id TEXT PRIMARY KEY, doc BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS equivalents (id TEXT PRIMARY KEY, doc BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS order_patterns (id TEXT PRIMARY KEY, doc BLOB NOT NULL);
+
+CREATE TABLE IF NOT EXISTS row_counts (name TEXT PRIMARY KEY, count INTEGER NOT NULL);
+"""
+
+# Tables whose count() reads a row count kept up to date by triggers,
+# instead of a COUNT(*) scan (history and favorites promise a cheap count)
+COUNTED_TABLES = ("search_history", "favorites")
+
+COUNT_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS {table}_counted_insert AFTER INSERT ON {table}
+BEGIN UPDATE row_counts SET count = count + 1 WHERE name = '{table}'; END;
+CREATE TRIGGER IF NOT EXISTS {table}_counted_delete AFTER DELETE ON {table}
+BEGIN UPDATE row_counts SET count = count - 1 WHERE name = '{table}'; END;
+"""
+
+# Rows fetched per round when iterating a whole table
+ITER_BATCH_SIZE = 500
+
+
+def _sort_key(value: Optional[datetime]) -> Optional[str]:
+    """Datetime as fixed-width text (millisecond precision, like BSON) so it sorts correctly."""
+    if value is None:
+        return None
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}"
+
+
+def _encode(document: Document) -> bytes:
+    return bson.encode(document)
+
+
+def _decode(blob: bytes, fields: Optional[List[str]] = None) -> Document:
+    document = bson.decode(blob)
+    if fields:
+        keep = {"_id", *fields}
+        document = {key: value for key, value in document.items() if key in keep}
+    return document
+
+
+def _keyset_clause(column: str, after: Optional[Cursor]) -> tuple[str, list]:
+    """WHERE clause for items after `after` in a (column DESC, id DESC) sort; NULLs sort last."""
+    if after is None:
+        return "", []
+
+    value, doc_id = after
+    if value is None:
+        return f"WHERE {column} IS NULL AND id < ?", [str(doc_id)]
+
+    key = _sort_key(value)
+    return (
+        f"WHERE ({column} < ? OR ({column} = ? AND id < ?) OR {column} IS NULL)",
+        [key, key, str(doc_id)],
+    )
+
+
+def _row_count(db: sqlite3.Connection, table: str) -> int:
+    return db.execute("SELECT count FROM row_counts WHERE name = ?", (table,)).fetchone()[0]
+
+
+async def _iter_table(db: sqlite3.Connection, table: str) -> AsyncIterator[Document]:
+    """Every document in `table` in id order, ITER_BATCH_SIZE rows per query."""
+    last_id = ""
+    while True:
+        rows = db.execute(
+            f"SELECT id, doc FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, ITER_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+        for row_id, doc in rows:
+            yield _decode(doc)
+        last_id = rows[-1][0]
+
+
+class SQLiteHistoryRepository(HistoryRepository):
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    async def add_many(self, documents: List[Document]) -> List[Document]:
+        rows = []
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            rows.append((str(document["_id"]), _sort_key(document.get("timestamp")), _encode(document)))
+        self.db.executemany("INSERT OR IGNORE INTO search_history (id, timestamp, doc) VALUES (?, ?, ?)", rows)
+
+        # Stand-in for Mongo's TTL index
+        cutoff = datetime.utcnow() - timedelta(days=settings.search_history_retention_days)
+        self.db.execute("DELETE FROM search_history WHERE timestamp < ?", (_sort_key(cutoff),))
+        return []
+
+    async def list(self, limit: int, after: Optional[Cursor] = None, fields: Optional[List[str]] = None) -> List[Document]:
+        where, params = _keyset_clause("timestamp", after)
+        rows = self.db.execute(
+            f"SELECT doc FROM search_history {where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+            [*params, limit]
+        )
+        return [_decode(doc, fields) for (doc,) in rows]
+
+    async def count(self) -> int:
+        return _row_count(self.db, "search_history")
+
+    async def clear(self) -> int:
+        return self.db.execute("DELETE FROM search_history").rowcount
+
+    def export(self) -> AsyncIterator[Document]:
+        return _iter_table(self.db, "search_history")
+
+    async def import_many(self, documents: List[Document]) -> int:
+        rows = []
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            rows.append((str(document["_id"]), _sort_key(document.get("timestamp")), _encode(document)))
+
+        before = self.db.total_changes
+        # One transaction per batch rather than one per row
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR IGNORE INTO search_history (id, timestamp, doc) VALUES (?, ?, ?)", rows)
+        return self.db.total_changes - before
+
+
+class SQLiteFavoritesRepository(FavoritesRepository):
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def _get(self, favorite_id: ObjectId) -> Optional[Document]:
+        row = self.db.execute("SELECT doc FROM favorites WHERE id = ?", (str(favorite_id),)).fetchone()
+        return _decode(row[0]) if row else None
+
+    def _put(self, document: Document) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO favorites (id, search_query, last_ordered, doc) VALUES (?, ?, ?, ?)",
+            (str(document["_id"]), document["search_query"], _sort_key(document.get("last_ordered")), _encode(document))
+        )
+
+    async def list(self, limit: int, after: Optional[Cursor] = None, fields: Optional[List[str]] = None) -> List[Document]:
+        where, params = _keyset_clause("last_ordered", after)
+        rows = self.db.execute(
+            f"SELECT doc FROM favorites {where} ORDER BY last_ordered DESC, id DESC LIMIT ?",
+            [*params, limit]
+        )
+        return [_decode(doc, fields) for (doc,) in rows]
+
+    async def count(self) -> int:
+        return _row_count(self.db, "favorites")
+
+    async def get_or_create(self, document: Document) -> Document:
+        row = self.db.execute("SELECT doc FROM favorites WHERE search_query = ?", (document["search_query"],)).fetchone()
+        if row:
+            return _decode(row[0])
+
+        document = {"_id": ObjectId(), **document}
+        self._put(document)
+        return _decode(_encode(document))
+
+    async def get(self, favorite_id: ObjectId) -> Optional[Document]:
+        return self._get(favorite_id)
+
+    async def update(self, favorite_id: ObjectId, fields: Document) -> Optional[Document]:
+        document = self._get(favorite_id)
+        if document is None:
+            return None
+
+        document.update(fields)
+        self._put(document)
+        return _decode(_encode(document))
+
+    async def increment_orders(self, favorite_id: ObjectId, ordered_at: datetime) -> Optional[Document]:
+        document = self._get(favorite_id)
+        if document is None:
+            return None
+
+        document["times_ordered"] = document.get("times_ordered", 0) + 1
+        document["last_ordered"] = ordered_at
+        self._put(document)
+        return _decode(_encode(document))
+
+    async def delete(self, favorite_id: ObjectId) -> bool:
+        return self.db.execute("DELETE FROM favorites WHERE id = ?", (str(favorite_id),)).rowcount > 0
+
+    def export(self) -> AsyncIterator[Document]:
+        return _iter_table(self.db, "favorites")
+
+    async def upsert_many(self, documents: List[Document]) -> Tuple[int, int]:
+        inserted = updated = 0
+        # One transaction per batch rather than one per row
+        with self.db:
+            self.db.execute("BEGIN")
+            for document in documents:
+                row = self.db.execute(
+                    "SELECT doc FROM favorites WHERE search_query = ?", (document["search_query"],)
+                ).fetchone()
+                if row:
+                    existing = _decode(row[0])
+                    existing.update({key: value for key, value in document.items() if key != "_id"})
+                    self._put(existing)
+                    updated += 1
+                    continue
+
+                document.setdefault("_id", ObjectId())
+                if self._get(document["_id"]) is not None:
+                    # The imported _id belongs to another favorite; skipped, like Mongo's duplicate key error
+                    continue
+                self._put(document)
+                inserted += 1
+        return inserted, updated
+
+
+class SQLitePricingCacheRepository(PricingCacheRepository):
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    async def get(self, vendor: str, query: str) -> Optional[Document]:
+        row = self.db.execute("SELECT doc FROM pricing_cache WHERE vendor = ? AND query = ?", (vendor, query)).fetchone()
+        if not row:
+            return None
+
+        # Stand-in for Mongo's TTL index
+        document = _decode(row[0])
+        if datetime.utcnow() - document["fetched_at"] > timedelta(days=settings.cache_expiry_days):
+            return None
+        return document
+
+    async def put(self, vendor: str, query: str, pricing: Optional[Dict[str, float]], fetched_at: datetime) -> None:
+        document = {"vendor": vendor, "query": query, "pricing": pricing, "fetched_at": fetched_at}
+        self.db.execute(
+            "INSERT OR REPLACE INTO pricing_cache (vendor, query, doc) VALUES (?, ?, ?)",
+            (vendor, query, _encode(document))
+        )
+
+
+class SQLiteDocumentRepository(DocumentRepository):
+    """Document store backed by one (id, doc) table."""
+
+    table: str
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    async def save(self, document: Document) -> ObjectId:
+        document.setdefault("_id", ObjectId())
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {self.table} (id, doc) VALUES (?, ?)",
+            (str(document["_id"]), _encode(document))
+        )
+        return document["_id"]
+
+    def all(self) -> AsyncIterator[Document]:
+        return _iter_table(self.db, self.table)
+
+    async def count(self) -> int:
+        return self.db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class SQLiteCatalogRepository(SQLiteDocumentRepository, CatalogRepository):
+    table = "parts_catalog"
+
+
+class SQLiteEquivalentsRepository(SQLiteDocumentRepository, EquivalentsRepository):
+    table = "equivalents"
+
+
+class SQLiteOrderPatternRepository(SQLiteDocumentRepository, OrderPatternRepository):
+    table = "order_patterns"
+
+
+class SQLiteStorage(Storage):
+    """
+    Local SQLite backend for single-site installs and benchmarks.
+
+    path=":memory:" keeps everything in process (nothing persisted).
+    Queries run inline on the event loop: they're local and take
+    microseconds, which is the point of this backend.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db: Optional[sqlite3.Connection] = None
+
+    async def connect(self) -> None:
+        # Autocommit; every statement is its own transaction
+        self.db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        # INSERT OR REPLACE fires the delete trigger for the row it replaces
+        self.db.execute("PRAGMA recursive_triggers=ON")
+        self.db.executescript(SCHEMA)
+        for table in COUNTED_TABLES:
+            self.db.executescript(COUNT_TRIGGERS.format(table=table))
+            # Seeded with one scan per database; the triggers keep it current from then on
+            if self.db.execute("SELECT 1 FROM row_counts WHERE name = ?", (table,)).fetchone() is None:
+                self.db.execute(
+                    f"INSERT OR IGNORE INTO row_counts (name, count) SELECT ?, COUNT(*) FROM {table}", (table,)
+                )
+
+        self.history = SQLiteHistoryRepository(self.db)
+        self.favorites = SQLiteFavoritesRepository(self.db)
+        self.pricing_cache = SQLitePricingCacheRepository(self.db)
+        self.catalog = SQLiteCatalogRepository(self.db)
+        self.equivalents = SQLiteEquivalentsRepository(self.db)
+        self.order_patterns = SQLiteOrderPatternRepository(self.db)
+        print(f"✅ Opened SQLite storage: {self.path}")
+
+    async def close(self) -> None:
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+            print("🔌 SQLite storage closed")
+
+    async def health(self) -> Dict[str, Any]:
+        if self.db is None:
+            return {"backend": "sqlite", "status": "disconnected"}
+        try:
+            self.db.execute("SELECT 1").fetchone()
+        except sqlite3.Error as e:
+            return {"backend": "sqlite", "status": "unreachable", "error": str(e)}
+        return {"backend": "sqlite", "status": "connected", "path": self.path}
@@ -0,0 +1,41 @@
+from typing import Optional
+
+from app.config import settings
+from app.repositories.base import Storage
+
+
+class StorageHolder:
+    """The active storage backend, chosen by settings.storage_backend."""
+
+    backend: Optional[Storage] = None
+
+
+storage_holder = StorageHolder()
+
+
+def create_storage() -> Storage:
+    """Build the backend named by settings.storage_backend ("mongo" or "sqlite")."""
+    if settings.storage_backend == "mongo":
+        from app.repositories.mongo import MongoStorage
+        return MongoStorage()
+    if settings.storage_backend == "sqlite":
+        from app.repositories.sqlite import SQLiteStorage
+        return SQLiteStorage(settings.sqlite_path)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.storage_backend!r} (expected 'mongo' or 'sqlite')")
+
+
+async def connect_storage(backend: Optional[Storage] = None) -> Storage:
+    """Connect the configured backend (or the one given) and make it active."""
+    storage_holder.backend = backend or create_storage()
+    await storage_holder.backend.connect()
+    return storage_holder.backend
+
+
+async def close_storage() -> None:
+    if storage_holder.backend is not None:
+        await storage_holder.backend.close()
+
+
+def get_storage() -> Optional[Storage]:
+    """Get the active storage backend (None before startup)."""
+    return storage_holder.backend
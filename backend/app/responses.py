@@ -0,0 +1,39 @@
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    """Types orjson doesn't know (datetimes it handles itself)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    JSON for a response: models through their own pydantic serializer
+    (by alias, as FastAPI would), anything else (raw documents, lists of
+    models) through orjson.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with pydantic-core/orjson instead of json.dumps.
+
+    Returning one from a route with an already-built model also skips
+    FastAPI's response_model pass, which would dump the model to a dict
+    and validate it all over again.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
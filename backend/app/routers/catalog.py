@@ -0,0 +1,75 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Optional
+
+from app.models.schemas import CatalogImportResponse, CatalogMatch
+from app.repositories.storage import get_storage
+from app.responses import FastJSONResponse
+from app.services.catalog import build_catalogs, catalog_index, parse_parts_list
+
+router = APIRouter(prefix="/api/catalog", tags=["catalog"])
+
+
+@router.post("/import", response_model=CatalogImportResponse)
+async def import_parts_list(
+    request: Request,
+    filename: str = Query(default="upload", description="Source file name, kept with the catalog"),
+    format: Optional[str] = Query(default=None, description="'csv' or 'json' (default: from Content-Type)")
+):
+    """
+    Import a parts list into the local catalog.
+
+    Send the file as the request body: CSV with a header row, or JSON. Columns
+    are brand, model, callout, description and part_number; rows without a
+    part number or description are skipped. Parts are searchable right away.
+    """
+    content_format = format or ("csv" if "csv" in request.headers.get("content-type", "") else "json")
+
+    try:
+        body = await request.body()
+        rows = parse_parts_list(body.decode("utf-8-sig"), content_format)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        catalogs, skipped = build_catalogs(rows, filename)
+
+        repository = get_storage().catalog
+        for catalog in catalogs:
+            await repository.save(catalog.model_dump(by_alias=True, exclude={"id"}))
+            catalog_index.add(catalog)
+
+        return CatalogImportResponse(
+            catalogs=len(catalogs),
+            parts=sum(len(catalog.parts) for catalog in catalogs),
+            skipped=skipped,
+            indexed=catalog_index.stats()["part_numbers"]
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/parts/{part_number}", response_model=List[CatalogMatch])
+async def lookup_part(part_number: str):
+    """
+    Look up a part number ("CB-440", "CB440" and "cb 440" are the same part).
+    """
+    matches = catalog_index.lookup(part_number)
+    if not matches:
+        raise HTTPException(status_code=404, detail="Part not in catalog")
+    return FastJSONResponse(matches)
+
+
+@router.get("/parts", response_model=List[CatalogMatch])
+async def search_parts_by_prefix(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(default=20, ge=1, le=200)
+):
+    """Parts whose part number starts with `prefix` (for autocomplete)."""
+    return FastJSONResponse(catalog_index.prefix(prefix, limit))
+
+
+@router.get("/stats")
+async def get_catalog_stats():
+    """Size of the in-memory part-number index."""
+    return catalog_index.stats()
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+
+from app.models.schemas import EquivalentMatch, EquivalentOrder, EquivalentsMap
+from app.repositories.storage import get_storage
+from app.responses import FastJSONResponse
+from app.services.equivalents import equivalents_graph
+
+router = APIRouter(prefix="/api/equivalents", tags=["equivalents"])
+
+
+async def save_map(equivalents_map: EquivalentsMap) -> None:
+    """Insert or replace the stored map (assigning its id on first save)."""
+    document = equivalents_map.model_dump(by_alias=True, exclude={"id"})
+    if equivalents_map.id is not None:
+        document["_id"] = equivalents_map.id
+    equivalents_map.id = await get_storage().equivalents.save(document)
+
+
+@router.get("", response_model=List[EquivalentMatch])
+async def get_equivalents(
+    part_number: str = Query(...),
+    brand: Optional[str] = Query(default=None, description="Omit to merge every brand's part with this number")
+):
+    """
+    Parts that fit in place of this one, best first, including equivalents
+    of equivalents (at lower confidence).
+    """
+    return FastJSONResponse(equivalents_graph.lookup(brand, part_number))
+
+
+@router.post("", response_model=EquivalentsMap)
+async def add_equivalents(equivalents_map: EquivalentsMap):
+    """
+    Add a cross-reference: the primary part ({"brand", "part_number"}) and
+    the parts that fit in its place.
+    """
+    primary = equivalents_map.primary_part
+    if not primary.get("brand") or not primary.get("part_number"):
+        raise HTTPException(status_code=400, detail="primary_part needs a brand and part_number")
+
+    try:
+        equivalents_map.id = None
+        await save_map(equivalents_map)
+        equivalents_graph.add(equivalents_map)
+        return FastJSONResponse(equivalents_map)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/orders", response_model=List[EquivalentMatch])
+async def record_equivalent_order(order: EquivalentOrder):
+    """
+    Record that an equivalent was ordered and fit.
+
+    Raises its confidence for future lookups (or creates a user-confirmed
+    link if there wasn't one). Returns the part's updated equivalents.
+    """
+    try:
+        equivalents_map = equivalents_graph.record_order(
+            order.brand, order.part_number,
+            order.equivalent_brand, order.equivalent_part_number
+        )
+        await save_map(equivalents_map)
+        return FastJSONResponse(equivalents_graph.lookup(order.brand, order.part_number))
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def get_equivalents_stats():
+    """Size of the in-memory equivalents graph and its lookup cache."""
+    return equivalents_graph.stats()
@@ -1,38 +1,140 @@
-from fastapi import APIRouter, HTTPException, Path
-from typing import List
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 
 from app.models.schemas import (
+    BulkImportResponse,
     Favorite,
     FavoriteCreate,
     FavoriteUpdate,
     FavoriteResponse
 )
-from app.database.mongodb import get_database
+from app.database.pagination import decode_cursor, encode_cursor, projection_for
+from app.repositories.base import Cursor
+from app.repositories.storage import get_storage
+from app.responses import FastJSONResponse
+from app.services.ndjson import MEDIA_TYPE, NDJSONImport, export_lines
+from app.services.order_ranking import order_ranking
+from app.services.response_cache import response_cache
 
 router = APIRouter(prefix="/api/favorites", tags=["favorites"])
 
 
+# Fields a client may ask for with ?fields= (_id is always returned)
+FAVORITE_FIELDS = [name for name in Favorite.model_fields if name != "id"]
+
+
+async def _favorites_page(limit: int, cursor: Optional[Cursor], projection: Optional[List[str]]):
+    repository = get_storage().favorites
+
+    favorites = await repository.list(limit, after=cursor, fields=projection)
+    total = await repository.count()
+
+    next_cursor = None
+    if favorites and len(favorites) == limit:
+        last = favorites[-1]
+        next_cursor = encode_cursor(last.get("last_ordered"), last["_id"])
+
+    if projection is not None:
+        return {"favorites": favorites, "total": total, "next_cursor": next_cursor}
+
+    favorite_items = [Favorite(**item) for item in favorites]
+
+    return FavoriteResponse(
+        favorites=favorite_items,
+        total=total,
+        next_cursor=next_cursor
+    )
+
+
 @router.get("", response_model=FavoriteResponse)
-async def get_favorites():
+async def get_favorites(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=500),
+    after: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated fields to return")
+):
     """
-    Get all favorite parts.
+    Get favorite parts, a page at a time.
+
+    Returns favorites ordered by last_ordered (most recent first; never
+    ordered last). Pass the response's next_cursor as `after` for the next
+    page. With `fields`, only those fields (plus _id and last_ordered) are
+    returned, unvalidated.
 
-    Returns favorites ordered by last_ordered (most recent first).
+    Responses carry an ETag; send it back in If-None-Match to get a 304
+    when no favorite changed since.
     """
     try:
-        db = get_database()
+        cursor = decode_cursor(after) if after else None
+        projection = projection_for(fields, FAVORITE_FIELDS, required=["last_ordered"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        cursor = db.favorites.find().sort("last_ordered", -1)
-        favorites = await cursor.to_list(length=None)
+    try:
+        return await response_cache.respond(
+            request, "favorites", lambda: _favorites_page(limit, cursor, projection)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        favorite_items = [Favorite(**item) for item in favorites]
-        total = len(favorite_items)
 
-        return FavoriteResponse(
-            favorites=favorite_items,
-            total=total
+@router.get("/export")
+async def export_favorites():
+    """
+    Download every favorite as NDJSON (one JSON document per line).
+
+    Streamed straight from the database; POST the file to
+    /api/favorites/import on another install to copy it over.
+    """
+    try:
+        filename = f"favorites-{datetime.utcnow():%Y%m%d}.ndjson"
+
+        return StreamingResponse(
+            export_lines(get_storage().favorites.export()),
+            media_type=MEDIA_TYPE,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/import", response_model=BulkImportResponse)
+async def import_favorites(request: Request):
+    """
+    Import favorites from NDJSON (as written by /api/favorites/export), sent
+    as the request body.
+
+    The upload is read and upserted a batch at a time, keyed on
+    search_query: a favorite that already exists is updated with the
+    imported fields and keeps its _id. Invalid lines are skipped and
+    reported.
+    """
+    try:
+        upload = NDJSONImport(Favorite)
+        repository = get_storage().favorites
+        inserted = updated = 0
+
+        async for batch in upload.batches(request.stream()):
+            batch_inserted, batch_updated = await repository.upsert_many(batch)
+            inserted += batch_inserted
+            updated += batch_updated
+            response_cache.bump("favorites")
+
+        # Imported preferred vendors count towards vendor ranking
+        await order_ranking.reload(get_storage())
+
+        return BulkImportResponse(
+            received=upload.received,
+            inserted=inserted,
+            updated=updated,
+            skipped=upload.received - upload.invalid - inserted - updated,
+            invalid=upload.invalid,
+            errors=upload.errors
         )
 
     except Exception as e:
@@ -47,15 +149,6 @@ async def create_favorite(favorite: FavoriteCreate):
     If the part already exists (same search_query), returns existing favorite.
     """
     try:
-        db = get_database()
-
-        # Check if already exists
-        existing = await db.favorites.find_one({"search_query": favorite.search_query})
-
-        if existing:
-            return Favorite(**existing)
-
-        # Create new favorite
         new_favorite = Favorite(
             part_description=favorite.part_description,
             search_query=favorite.search_query,
@@ -63,13 +156,12 @@ async def create_favorite(favorite: FavoriteCreate):
             created_at=datetime.utcnow()
         )
 
-        result = await db.favorites.insert_one(
+        result = await get_storage().favorites.get_or_create(
             new_favorite.model_dump(by_alias=True, exclude={"id"})
         )
+        response_cache.bump("favorites")
 
-        new_favorite.id = result.inserted_id
-
-        return new_favorite
+        return FastJSONResponse(Favorite(**result))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -84,8 +176,6 @@ async def update_favorite(
     Update a favorite (e.g., increment times_ordered, update preferred_vendor).
     """
     try:
-        db = get_database()
-
         # Build update document
         update_data = {}
         if update.times_ordered is not None:
@@ -99,17 +189,21 @@ async def update_favorite(
             raise HTTPException(status_code=400, detail="No update data provided")
 
         # Update favorite
-        result = await db.favorites.find_one_and_update(
-            {"_id": ObjectId(favorite_id)},
-            {"$set": update_data},
-            return_document=True
-        )
+        repository = get_storage().favorites
+        previous = await repository.get(ObjectId(favorite_id))
+        result = await repository.update(ObjectId(favorite_id), update_data) if previous else None
 
         if not result:
             raise HTTPException(status_code=404, detail="Favorite not found")
+        response_cache.bump("favorites")
+
+        # A new preferred vendor (or order count) moves the favorite's orders in vendor ranking
+        order_ranking.record_favorite(result, previous)
 
-        return Favorite(**result)
+        return FastJSONResponse(Favorite(**result))
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -118,15 +212,19 @@ async def update_favorite(
 async def delete_favorite(favorite_id: str = Path(...)):
     """Delete a favorite part."""
     try:
-        db = get_database()
-
-        result = await db.favorites.delete_one({"_id": ObjectId(favorite_id)})
+        repository = get_storage().favorites
+        previous = await repository.get(ObjectId(favorite_id))
+        deleted = previous is not None and await repository.delete(ObjectId(favorite_id))
 
-        if result.deleted_count == 0:
+        if not deleted:
             raise HTTPException(status_code=404, detail="Favorite not found")
+        response_cache.bump("favorites")
+        order_ranking.record_favorite(None, previous)
 
         return {"status": "success", "deleted_id": favorite_id}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -136,24 +234,22 @@ async def increment_order_count(favorite_id: str = Path(...)):
     """
     Increment times_ordered count for a favorite.
 
-    Convenience endpoint for quick order tracking.
+    Convenience endpoint for quick order tracking. With a preferred
+    vendor set, the order also counts towards vendor ranking.
     """
     try:
-        db = get_database()
-
-        result = await db.favorites.find_one_and_update(
-            {"_id": ObjectId(favorite_id)},
-            {
-                "$inc": {"times_ordered": 1},
-                "$set": {"last_ordered": datetime.utcnow()}
-            },
-            return_document=True
-        )
+        result = await get_storage().favorites.increment_orders(ObjectId(favorite_id), datetime.utcnow())
 
         if not result:
             raise HTTPException(status_code=404, detail="Favorite not found")
+        response_cache.bump("favorites")
+
+        # Taken back as stored before the increment, so the weight matches a reload
+        order_ranking.record_favorite(result, {**result, "times_ordered": result["times_ordered"] - 1})
 
-        return Favorite(**result)
+        return FastJSONResponse(Favorite(**result))
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,38 +1,79 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from datetime import datetime
 
-from app.models.schemas import SearchHistory, SearchHistoryResponse
-from app.database.mongodb import get_database
+from app.models.schemas import BulkImportResponse, SearchHistory, SearchHistoryResponse
+from app.database.pagination import decode_cursor, encode_cursor, projection_for
+from app.repositories.base import Cursor
+from app.repositories.storage import get_storage
+from app.services.history_writer import history_writer
+from app.services.ndjson import MEDIA_TYPE, NDJSONImport, export_lines
+from app.services.response_cache import response_cache
 from app.config import settings
 
 router = APIRouter(prefix="/api/history", tags=["history"])
 
 
+# Fields a client may ask for with ?fields= (_id is always returned)
+HISTORY_FIELDS = [name for name in SearchHistory.model_fields if name != "id"]
+
+
+async def _history_page(limit: int, cursor: Optional[Cursor], projection: Optional[List[str]]):
+    repository = get_storage().history
+
+    # Fetch recent searches
+    history = await repository.list(limit, after=cursor, fields=projection)
+    total = await repository.count()
+
+    next_cursor = None
+    if history and len(history) == limit:
+        last = history[-1]
+        next_cursor = encode_cursor(last.get("timestamp"), last["_id"])
+
+    if projection is not None:
+        return {"history": history, "total": total, "next_cursor": next_cursor}
+
+    # Convert to SearchHistory models
+    history_items = [SearchHistory(**item) for item in history]
+
+    return SearchHistoryResponse(
+        history=history_items,
+        total=total,
+        next_cursor=next_cursor
+    )
+
+
 @router.get("", response_model=SearchHistoryResponse)
 async def get_search_history(
-    limit: int = Query(default=50, le=settings.search_history_limit)
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=settings.search_history_limit),
+    after: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated fields to return")
 ):
     """
     Get recent search history.
 
-    Returns last N searches ordered by timestamp (newest first).
+    Returns last N searches ordered by timestamp (newest first). Pass the
+    response's next_cursor as `after` for the next page. With `fields`,
+    only those fields (plus _id and timestamp) are returned, unvalidated.
+
+    Responses carry an ETag; send it back in If-None-Match to get a 304
+    when no search was made since.
     """
     try:
-        db = get_database()
-
-        # Fetch recent searches
-        cursor = db.search_history.find().sort("timestamp", -1).limit(limit)
-        history = await cursor.to_list(length=limit)
-
-        # Convert to SearchHistory models
-        history_items = [SearchHistory(**item) for item in history]
+        cursor = decode_cursor(after) if after else None
+        projection = projection_for(fields, HISTORY_FIELDS, required=["timestamp"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        total = await db.search_history.count_documents({})
+    try:
+        # Include searches still waiting in the write buffer. Flushing bumps
+        # the history version, so it happens before the ETag is taken.
+        await history_writer.flush()
 
-        return SearchHistoryResponse(
-            history=history_items,
-            total=total
+        return await response_cache.respond(
+            request, "history", lambda: _history_page(limit, cursor, projection)
         )
 
     except Exception as e:
@@ -43,13 +84,71 @@ async def get_search_history(
 async def clear_search_history():
     """Clear all search history."""
     try:
-        db = get_database()
-        result = await db.search_history.delete_many({})
+        history_writer.clear()
+        deleted_count = await get_storage().history.clear()
+        response_cache.bump("history")
 
         return {
             "status": "success",
-            "deleted_count": result.deleted_count
+            "deleted_count": deleted_count
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/export")
+async def export_search_history():
+    """
+    Download every history entry as NDJSON (one JSON document per line),
+    oldest first.
+
+    Streamed straight from the database, so the size of the history
+    doesn't matter; POST the file to /api/history/import on another
+    install to copy it over.
+    """
+    try:
+        # Include searches still waiting in the write buffer
+        await history_writer.flush()
+        filename = f"history-{datetime.utcnow():%Y%m%d}.ndjson"
+
+        return StreamingResponse(
+            export_lines(get_storage().history.export()),
+            media_type=MEDIA_TYPE,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/import", response_model=BulkImportResponse)
+async def import_search_history(request: Request):
+    """
+    Import history from NDJSON (as written by /api/history/export), sent as
+    the request body.
+
+    The upload is read and inserted a batch at a time. Entries keep their
+    _id, so importing the same file twice skips what's already there;
+    invalid lines are skipped and reported.
+    """
+    try:
+        upload = NDJSONImport(SearchHistory)
+        repository = get_storage().history
+        inserted = 0
+
+        async for batch in upload.batches(request.stream()):
+            inserted += await repository.import_many(batch)
+            response_cache.bump("history")
+
+        return BulkImportResponse(
+            received=upload.received,
+            inserted=inserted,
+            updated=0,
+            skipped=upload.received - upload.invalid - inserted,
+            invalid=upload.invalid,
+            errors=upload.errors
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
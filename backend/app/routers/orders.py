@@ -0,0 +1,63 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from app.models.schemas import OrderFeedback, OrderPattern, OrderSummary, VendorOrderStats
+from app.repositories.storage import get_storage
+from app.responses import FastJSONResponse
+from app.services.catalog import normalize_part_number
+from app.services.order_ranking import order_ranking
+from app.services.parser import QueryParser
+from app.services.scraper import VendorScraper
+
+router = APIRouter(prefix="/api/orders", tags=["orders"])
+
+
+@router.post("", response_model=OrderPattern)
+async def record_order(feedback: OrderFeedback):
+    """
+    Record what was actually ordered for a search, and where.
+
+    Vendors ordered from are ranked first in later searches for the same
+    part or brand (after the next background refresh).
+    """
+    vendor = VendorScraper.vendor_key(feedback.vendor)
+    if vendor is None:
+        raise HTTPException(status_code=400, detail=f"Unknown vendor: {feedback.vendor}")
+
+    ordered = normalize_part_number(feedback.part_ordered)
+    order = OrderPattern(
+        part_query=feedback.query,
+        ordered_from=vendor,
+        part_ordered=feedback.part_ordered,
+        price_paid=feedback.price,
+        equivalent_used=bool(ordered) and ordered not in normalize_part_number(feedback.query)
+    )
+
+    try:
+        order.id = await get_storage().order_patterns.save(
+            order.model_dump(by_alias=True, exclude={"id"})
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    order_ranking.record(order.part_query, vendor, order.price_paid)
+    return FastJSONResponse(order)
+
+
+@router.get("/summary", response_model=OrderSummary)
+async def get_order_summary(query: str = Query(..., min_length=1)):
+    """
+    Vendors ordered from for this query's part (or, failing that, its
+    brand, or overall), most ordered first, with the median price paid.
+    """
+    scope, stats = order_ranking.summary(QueryParser.parse(query))
+    vendors = [
+        VendorOrderStats(vendor=vendor, orders=vendor_stats.orders, median_price=vendor_stats.median_price)
+        for vendor, vendor_stats in sorted(stats.items(), key=lambda item: -item[1].orders)
+    ]
+    return FastJSONResponse(OrderSummary(query=query, scope=scope, vendors=vendors))
+
+
+@router.get("/stats")
+async def get_order_stats():
+    """Orders counted into the vendor ranking, and how many are waiting for the next refresh."""
+    return order_ranking.stats()
@@ -1,53 +1,214 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import List
 from datetime import datetime
 
+from app import config
 from app.models.schemas import (
+    CatalogMatch,
+    EquivalentMatch,
     SearchRequest,
     SearchResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
+    BatchSearchItem,
     ParsedQuery,
     SearchHistory
 )
+from app.responses import FastJSONResponse
 from app.services.parser import QueryParser
+from app.services.catalog import catalog_index
+from app.services.equivalents import equivalents_graph
+from app.services.order_ranking import order_ranking
 from app.services.scraper import VendorScraper
-from app.database.mongodb import get_database
+from app.services.pricing_cache import pricing_cache
+from app.services.pricing_jobs import pricing_jobs
+from app.services.history_writer import history_writer
+from app.services.metrics import span
+from app.services.response_cache import response_cache
 
 router = APIRouter(prefix="/api/search", tags=["search"])
 
 
+def find_equivalents(parsed: ParsedQuery, catalog_matches: List[CatalogMatch]) -> List[EquivalentMatch]:
+    """Equivalents of the part searched for: the catalog match, else the model number."""
+    if catalog_matches:
+        return equivalents_graph.lookup(catalog_matches[0].brand, catalog_matches[0].part_number)
+    if parsed.model:
+        return equivalents_graph.lookup(parsed.brand, parsed.model)
+    return []
+
+
 @router.post("", response_model=SearchResponse)
 async def search_parts(request: SearchRequest):
     """
     Search for tool parts across multiple vendors.
 
-    Returns instant URLs for vendor search results.
+    Returns instant URLs for vendor search results. With `stream: true`,
+    pricing isn't waited for: priced vendors come back as "processing" and
+    their updates are streamed from /api/search/{search_id}/stream (single
+    worker only; with several, streamed searches are priced inline).
+
+    Part numbers found in the local catalog come back in `catalog_matches`,
+    and vendors are searched for the exact part number instead. Known
+    cross-brand equivalents of the part come back in `equivalents`.
+    Results are ordered by where this part was ordered from before.
     """
     try:
         # Parse the query
-        parsed = QueryParser.parse(request.query)
+        with span("parse"):
+            parsed = QueryParser.parse(request.query)
+
+        # Known parts first: an in-memory lookup, no vendor involved
+        with span("catalog_lookup"):
+            catalog_matches = catalog_index.find_in_query(request.query)
 
         # Build optimized search query
-        search_query = QueryParser.build_search_query(parsed)
+        with span("build_search_query"):
+            if catalog_matches:
+                search_query = catalog_index.search_query_for(catalog_matches[0])
+            else:
+                search_query = QueryParser.build_search_query(parsed)
+
+        # Vendors this part (or brand) was usually bought from come first
+        with span("rank_vendors"):
+            vendors = order_ranking.rank(parsed, request.vendors)
 
         # Get search results from all vendors
-        results = await VendorScraper.search_all_vendors(search_query, request.vendors)
+        search_id = None
+        with span("search_all_vendors"):
+            # The SSE stream must reach the worker holding the jobs; with
+            # several workers it may not, so price inline instead
+            if request.stream and config.server_workers == 1:
+                vendors = [v for v in vendors if v in VendorScraper.VENDOR_TEMPLATES]
+                results = await VendorScraper.search_all_vendors(search_query, vendors, pricing=False)
+                search_id = pricing_jobs.submit(search_query, vendors, results)
+            else:
+                results = await VendorScraper.search_all_vendors(search_query, vendors)
 
-        # Save to search history
-        db = get_database()
-        history_entry = SearchHistory(
-            query=request.query,
-            parsed=parsed,
-            timestamp=datetime.utcnow(),
-            results_opened=[r.vendor for r in results]
-        )
+        # Save to search history (buffered; doesn't wait on the database)
+        with span("history_write"):
+            history_entry = SearchHistory(
+                query=request.query,
+                parsed=parsed,
+                timestamp=datetime.utcnow(),
+                results_opened=[r.vendor for r in results]
+            )
 
-        await db.search_history.insert_one(history_entry.model_dump(by_alias=True, exclude={"id"}))
+            history_writer.write(history_entry.model_dump(by_alias=True, exclude={"id"}))
+            response_cache.bump("history")
 
-        return SearchResponse(
+        with span("equivalents"):
+            equivalents = find_equivalents(parsed, catalog_matches)
+
+        # Built here from known-good parts: skip the response_model pass
+        return FastJSONResponse(SearchResponse(
             parsed=parsed,
             results=results,
-            ai_suggestions=None  # Phase 3 feature
-        )
+            ai_suggestions=None,  # Phase 3 feature
+            search_id=search_id,
+            catalog_matches=catalog_matches,
+            equivalents=equivalents
+        ))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/batch", response_model=BatchSearchResponse)
+async def search_parts_batch(request: BatchSearchRequest):
+    """
+    Search a whole parts list in one round trip.
+
+    Each line is parsed and gets its own vendor URLs; lines that fail are
+    reported per item instead of failing the batch. Results come back in
+    request order and history is buffered for the background writer.
+    """
+    try:
+        items = []
+        history_docs = []
+        # Repeated lines (same part off several diagrams) share their URLs
+        results_by_search_query = {}
+        timestamp = datetime.utcnow()
+
+        for query in request.queries:
+            if not query.strip():
+                items.append(BatchSearchItem(query=query, error="Empty query"))
+                continue
+
+            try:
+                parsed = QueryParser.parse(query)
+                catalog_matches = catalog_index.find_in_query(query)
+                if catalog_matches:
+                    search_query = catalog_index.search_query_for(catalog_matches[0])
+                else:
+                    search_query = QueryParser.build_search_query(parsed)
+
+                vendors = order_ranking.rank(parsed, request.vendors)
+
+                results = results_by_search_query.get((search_query, tuple(vendors)))
+                if results is None:
+                    # URLs only; pricing 500 lines would blow the search deadline
+                    results = await VendorScraper.search_all_vendors(
+                        search_query, vendors, pricing=False
+                    )
+                    results_by_search_query[(search_query, tuple(vendors))] = results
+            except Exception as e:
+                items.append(BatchSearchItem(query=query, error=str(e)))
+                continue
+
+            items.append(BatchSearchItem(
+                query=query,
+                parsed=parsed,
+                results=results,
+                catalog_matches=catalog_matches
+            ))
+            history_docs.append(SearchHistory(
+                query=query,
+                parsed=parsed,
+                timestamp=timestamp,
+                results_opened=[r.vendor for r in results]
+            ).model_dump(by_alias=True, exclude={"id"}))
+
+        history_writer.write_many(history_docs)
+        response_cache.bump("history")
+
+        return FastJSONResponse(BatchSearchResponse(
+            items=items,
+            total=len(items),
+            failed=sum(1 for item in items if item.error)
+        ))
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{search_id}/stream")
+async def stream_search_pricing(search_id: str):
+    """
+    Stream pricing updates for a `stream: true` search as Server-Sent Events.
+
+    Emits one `pricing` event per vendor ({"index", "result"}, where index
+    is the result's position in the search response), then `done`.
+    """
+    if not pricing_jobs.has_stream(search_id):
+        raise HTTPException(status_code=404, detail="Search stream not found")
+
+    return StreamingResponse(
+        pricing_jobs.events(search_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/cache")
+async def get_parser_cache_stats():
+    """Hit/miss counters for the query parser and pricing caches."""
+    return {
+        **QueryParser.cache_stats(),
+        "catalog": catalog_index.stats(),
+        "equivalents": equivalents_graph.stats(),
+        "pricing": pricing_cache.stats(),
+        "pricing_jobs": pricing_jobs.stats(),
+        "responses": response_cache.stats(),
+    }
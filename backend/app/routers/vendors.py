@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Request
+from typing import List
+
+from app.models.schemas import DEFAULT_VENDORS, VendorInfo
+from app.services.response_cache import StaticResponse
+from app.services.scraper import VendorScraper
+
+router = APIRouter(prefix="/api/vendors", tags=["vendors"])
+
+
+def _vendor_list() -> List[VendorInfo]:
+    """Every vendor, in the default search order (the rest after)."""
+    keys = [key for key in DEFAULT_VENDORS if key in VendorScraper.VENDOR_TEMPLATES]
+    keys += [key for key in VendorScraper.VENDOR_TEMPLATES if key not in keys]
+
+    vendors = []
+    for key in keys:
+        info = VendorScraper.VENDOR_INFO.get(key, {"name": key.title(), "logo": None})
+        vendors.append(VendorInfo(
+            key=key,
+            name=info["name"],
+            logo_url=info["logo"],
+            pricing=key in VendorScraper.PRICING_VENDORS,
+            default=key in DEFAULT_VENDORS
+        ))
+    return vendors
+
+
+# Vendors only change with a deploy: built once, cacheable by browsers
+_VENDORS = StaticResponse(_vendor_list(), max_age=3600)
+
+
+@router.get("", response_model=List[VendorInfo])
+async def get_vendors(request: Request):
+    """Vendors that can be searched, with display names and logos."""
+    return _VENDORS.respond(request)
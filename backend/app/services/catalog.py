@@ -0,0 +1,241 @@
+import csv
+import io
+import json
+import re
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.models.schemas import CatalogMatch, PartDetail, PartsCatalog
+from app.repositories.base import CatalogRepository
+
+
+# Columns a parts list may have; only description and part_number are required
+CATALOG_COLUMNS = ["brand", "model", "callout", "description", "part_number"]
+
+# Shortest normalized part number we'll look for inside a free-text query;
+# anything shorter matches too much ("10", "O2")
+MIN_QUERY_PART_LENGTH = 3
+
+# Adjacent query tokens joined when looking for part numbers ("cb 440")
+MAX_QUERY_TOKENS_PER_PART = 3
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]+")
+_QUERY_TOKEN = re.compile(r"[0-9A-Za-z]+")
+
+
+def normalize_part_number(part_number: str) -> str:
+    """Part number with case and separators removed: "cb-440", "CB 440" -> "CB440"."""
+    return _NON_ALNUM.sub("", part_number.upper())
+
+
+def parse_parts_list(content: str, content_format: str) -> List[Dict[str, str]]:
+    """
+    Read parts-list rows from CSV (with a header row) or JSON.
+
+    JSON may be a list of rows, or one catalog object whose brand and model
+    apply to every entry of its "parts" list. Raises ValueError for
+    unreadable content.
+    """
+    if content_format == "csv":
+        reader = csv.DictReader(io.StringIO(content))
+        if not reader.fieldnames:
+            raise ValueError("CSV has no header row")
+        return [
+            {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+            for row in reader
+        ]
+
+    if content_format == "json":
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+        if isinstance(data, dict):
+            defaults = {key: data.get(key) for key in ("brand", "model")}
+            data = [{**defaults, **row} for row in data.get("parts", [])]
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise ValueError("JSON must be a list of parts or an object with a 'parts' list")
+
+        return [
+            {key: str(row[key]).strip() for key in CATALOG_COLUMNS if row.get(key) is not None}
+            for row in data
+        ]
+
+    raise ValueError(f"Unsupported format: {content_format!r} (expected 'csv' or 'json')")
+
+
+def build_catalogs(rows: Iterable[Dict[str, str]], filename: str) -> Tuple[List[PartsCatalog], int]:
+    """Group rows into one PartsCatalog per (brand, model). Returns (catalogs, rows skipped)."""
+    grouped: Dict[Tuple[Optional[str], Optional[str]], List[PartDetail]] = {}
+    skipped = 0
+    for row in rows:
+        if not row.get("part_number") or not row.get("description"):
+            skipped += 1
+            continue
+        key = (row.get("brand") or None, row.get("model") or None)
+        grouped.setdefault(key, []).append(PartDetail(
+            callout=row.get("callout") or "",
+            description=row["description"],
+            part_number=row["part_number"]
+        ))
+
+    now = datetime.utcnow()
+    catalogs = [
+        PartsCatalog(
+            pdf_filename=filename,
+            brand=brand,
+            model=model,
+            parts=parts,
+            extracted_at=now,
+            expiry=now + timedelta(days=settings.cache_expiry_days)
+        )
+        for (brand, model), parts in grouped.items()
+    ]
+    return catalogs, skipped
+
+
+class CatalogIndex:
+    """
+    In-memory part-number index over every stored PartsCatalog.
+
+    Lookups are dict hits on either the part number as printed (exact) or
+    its normalized form, so "CB-440", "CB440" and "cb 440" all find the same
+    part. Prefix lookups bisect a sorted list of normalized keys. The index
+    is loaded from storage at startup and kept current by add().
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, List[CatalogMatch]] = {}
+        self._normalized: Dict[str, List[CatalogMatch]] = {}
+        self._seen: set = set()
+        self._sorted_keys: List[str] = []
+        self._sorted_stale = False
+
+    async def load(self, repository: CatalogRepository) -> int:
+        """Index every stored catalog; returns how many were read."""
+        loaded = 0
+        async for document in repository.all():
+            self.add(PartsCatalog(**document))
+            loaded += 1
+        return loaded
+
+    async def reload(self, repository: CatalogRepository) -> int:
+        """
+        Rebuild from storage (picking up catalogs imported through other
+        workers), swapping the new tables in at once.
+        """
+        fresh = CatalogIndex()
+        loaded = await fresh.load(repository)
+        self._exact, self._normalized, self._seen = fresh._exact, fresh._normalized, fresh._seen
+        self._sorted_keys, self._sorted_stale = fresh._sorted_keys, fresh._sorted_stale
+        return loaded
+
+    def add(self, catalog: PartsCatalog) -> int:
+        """Index a catalog's parts; returns how many were new."""
+        added = 0
+        for part in catalog.parts:
+            if not part.part_number:
+                continue
+            normalized = normalize_part_number(part.part_number)
+            if not normalized:
+                continue
+
+            # The same part re-imported (or listed twice) is indexed once
+            identity = (catalog.brand, catalog.model, part.callout, normalized)
+            if identity in self._seen:
+                continue
+            self._seen.add(identity)
+
+            match = CatalogMatch.model_construct(
+                brand=catalog.brand,
+                model=catalog.model,
+                callout=part.callout,
+                description=part.description,
+                part_number=part.part_number
+            )
+            self._exact.setdefault(part.part_number.strip().upper(), []).append(match)
+            if normalized not in self._normalized:
+                self._normalized[normalized] = []
+                self._sorted_stale = True
+            self._normalized[normalized].append(match)
+            added += 1
+        return added
+
+    def lookup(self, part_number: str) -> List[CatalogMatch]:
+        """Parts with this part number: exact spelling first, then normalized."""
+        matches = self._exact.get(part_number.strip().upper())
+        if matches:
+            return list(matches)
+        return list(self._normalized.get(normalize_part_number(part_number), []))
+
+    def prefix(self, prefix: str, limit: int = 20) -> List[CatalogMatch]:
+        """Parts whose normalized part number starts with the normalized prefix."""
+        key = normalize_part_number(prefix)
+        if not key:
+            return []
+
+        if self._sorted_stale:
+            self._sorted_keys = sorted(self._normalized)
+            self._sorted_stale = False
+
+        matches: List[CatalogMatch] = []
+        position = bisect_left(self._sorted_keys, key)
+        while position < len(self._sorted_keys) and len(matches) < limit:
+            candidate = self._sorted_keys[position]
+            if not candidate.startswith(key):
+                break
+            matches.extend(self._normalized[candidate])
+            position += 1
+        return matches[:limit]
+
+    def find_in_query(self, query: str) -> List[CatalogMatch]:
+        """
+        Known parts mentioned in a free-text query.
+
+        Every run of up to MAX_QUERY_TOKENS_PER_PART adjacent tokens is tried
+        as a normalized part number, so "milwaukee cb 440 anvil" finds CB440.
+        Candidates without a digit are skipped (they'd be words, not parts).
+        """
+        if not self._normalized:
+            return []
+
+        tokens = [token.upper() for token in _QUERY_TOKEN.findall(query)]
+        matches: List[CatalogMatch] = []
+        found = set()
+        for start in range(len(tokens)):
+            candidate = ""
+            for token in tokens[start:start + MAX_QUERY_TOKENS_PER_PART]:
+                candidate += token
+                if candidate in found or len(candidate) < MIN_QUERY_PART_LENGTH:
+                    continue
+                if not any(char.isdigit() for char in candidate):
+                    continue
+                parts = self._normalized.get(candidate)
+                if parts:
+                    found.add(candidate)
+                    matches.extend(parts)
+        return matches
+
+    @staticmethod
+    def search_query_for(match: CatalogMatch) -> str:
+        """Vendor search query for a known part: brand plus exact part number."""
+        return f"{match.brand} {match.part_number}" if match.brand else match.part_number
+
+    def clear(self) -> None:
+        self._exact.clear()
+        self._normalized.clear()
+        self._seen.clear()
+        self._sorted_keys = []
+        self._sorted_stale = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "part_numbers": len(self._normalized),
+            "parts": len(self._seen),
+        }
+
+
+catalog_index = CatalogIndex()
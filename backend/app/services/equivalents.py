@@ -0,0 +1,221 @@
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models.schemas import EquivalentMatch, EquivalentPart, EquivalentsMap
+from app.repositories.base import EquivalentsRepository
+from app.services.cache import TTLCache
+from app.services.catalog import normalize_part_number
+from app.services.parser import QueryParser
+
+
+# Each order of an equivalent that fit removes this share of the remaining
+# doubt: 0.6 confidence becomes 0.68 after one order, 0.74 after two, ...
+ORDER_DOUBT_DECAY = 0.8
+
+# Confidence given to an equivalent first learned from an order
+USER_CONFIRMED_CONFIDENCE = 0.9
+
+Node = Tuple[str, str]  # (lowercase canonical brand, normalized part number)
+
+
+def node_key(brand: str, part_number: str) -> Node:
+    """Graph key for a part: "IR", "ir" and "Ingersoll Rand" are one brand."""
+    return (QueryParser.normalize_brand(brand).lower(), normalize_part_number(part_number))
+
+
+class Link:
+    """
+    An equivalence between two parts (shared by both directions).
+
+    Points back at the EquivalentPart it came from, so order counts are
+    updated in the stored map as well.
+    """
+
+    __slots__ = ("part", "map")
+
+    def __init__(self, part: EquivalentPart, equivalents_map: EquivalentsMap):
+        self.part = part
+        self.map = equivalents_map
+
+    @property
+    def weight(self) -> float:
+        """Confidence raised by confirmed orders."""
+        confidence = self.part.confidence
+        return confidence + (1 - confidence) * (1 - ORDER_DOUBT_DECAY ** self.part.order_count)
+
+
+class EquivalentsGraph:
+    """
+    In-memory graph of cross-brand equivalents, built from EquivalentsMap
+    documents.
+
+    Each map links its primary part to every listed equivalent in both
+    directions; parts are keyed by (brand, normalized part number). A
+    lookup walks the graph best-first, multiplying confidences along the
+    way, so an IR part listed as fitting a CP part that in turn matches a
+    Makita part is found too, at lower confidence. Results are cached per
+    part until the graph changes.
+    """
+
+    def __init__(self):
+        self._links: Dict[Node, Dict[Node, Link]] = {}
+        self._names: Dict[Node, Tuple[str, str]] = {}
+        self._by_part_number: Dict[str, List[Node]] = {}
+        self._cache = TTLCache(settings.equivalents_cache_size, 0)
+
+    async def load(self, repository: EquivalentsRepository) -> int:
+        """Add every stored map; returns how many were read."""
+        loaded = 0
+        async for document in repository.all():
+            self.add(EquivalentsMap(**document))
+            loaded += 1
+        return loaded
+
+    async def reload(self, repository: EquivalentsRepository) -> int:
+        """
+        Rebuild from storage (picking up maps and orders recorded through
+        other workers), swapping the new graph in at once.
+        """
+        fresh = EquivalentsGraph()
+        loaded = await fresh.load(repository)
+        self._links, self._names, self._by_part_number = fresh._links, fresh._names, fresh._by_part_number
+        self._cache.clear()
+        return loaded
+
+    def _node(self, brand: str, part_number: str) -> Node:
+        node = node_key(brand, part_number)
+        if node not in self._links:
+            self._links[node] = {}
+            self._names[node] = (brand, part_number)
+            self._by_part_number.setdefault(node[1], []).append(node)
+        return node
+
+    def add(self, equivalents_map: EquivalentsMap) -> None:
+        """Link the map's primary part with each of its equivalents."""
+        primary = equivalents_map.primary_part
+        source = self._node(primary["brand"], primary["part_number"])
+
+        for part in equivalents_map.equivalents:
+            target = self._node(part.brand, part.part_number)
+            if target == source:
+                continue
+
+            # The same pair listed twice keeps the stronger link
+            link = Link(part, equivalents_map)
+            existing = self._links[source].get(target)
+            if existing is None or link.weight > existing.weight:
+                self._links[source][target] = link
+                self._links[target][source] = link
+
+        self._cache.clear()
+
+    def record_order(self, order_brand: str, order_part: str, brand: str, part_number: str) -> EquivalentsMap:
+        """
+        Count an order of `brand part_number` in place of `order_brand
+        order_part`. Creates a user-confirmed link if there wasn't one.
+        Returns the map that changed, for the caller to store.
+        """
+        source = node_key(order_brand, order_part)
+        target = node_key(brand, part_number)
+
+        link = self._links.get(source, {}).get(target)
+        if link is None:
+            equivalents_map = EquivalentsMap(
+                primary_part={"brand": order_brand, "part_number": order_part},
+                equivalents=[EquivalentPart(
+                    brand=brand,
+                    part_number=part_number,
+                    confidence=USER_CONFIRMED_CONFIDENCE,
+                    source="user_confirmed",
+                    order_count=1
+                )]
+            )
+            self.add(equivalents_map)
+            return equivalents_map
+
+        link.part.order_count += 1
+        self._cache.clear()
+        return link.map
+
+    def lookup(self, brand: Optional[str], part_number: str) -> List[EquivalentMatch]:
+        """
+        Equivalents of a part, best first. Without a brand, equivalents of
+        every brand's part with that number are merged.
+        """
+        if brand is None:
+            nodes = self._by_part_number.get(normalize_part_number(part_number), [])
+        else:
+            node = node_key(brand, part_number)
+            nodes = [node] if node in self._links else []
+
+        if len(nodes) == 1:
+            return self._equivalents_of(nodes[0])
+
+        best: Dict[Tuple[str, str], EquivalentMatch] = {}
+        for node in nodes:
+            for match in self._equivalents_of(node):
+                key = (match.brand, match.part_number)
+                if key not in best or match.confidence > best[key].confidence:
+                    best[key] = match
+        return sorted(best.values(), key=lambda match: -match.confidence)
+
+    def _equivalents_of(self, start: Node) -> List[EquivalentMatch]:
+        cached = self._cache.get(start)
+        if cached is not None:
+            return cached
+
+        # Best-first over confidence (a product of numbers <= 1 never grows,
+        # so each part is settled the first time it's popped)
+        confidence: Dict[Node, float] = {start: 1.0}
+        reached: Dict[Node, Tuple[int, Link]] = {}
+        heap = [(-1.0, 0, start)]
+        settled = set()
+        while heap:
+            negative, hops, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            if hops >= settings.equivalents_max_hops:
+                continue
+
+            for neighbor, link in self._links[node].items():
+                value = -negative * link.weight
+                if value < settings.equivalents_min_confidence or neighbor in settled:
+                    continue
+                if value > confidence.get(neighbor, 0.0):
+                    confidence[neighbor] = value
+                    reached[neighbor] = (hops + 1, link)
+                    heapq.heappush(heap, (-value, hops + 1, neighbor))
+
+        matches = []
+        for node, (hops, link) in reached.items():
+            brand, part_number = self._names[node]
+            matches.append(EquivalentMatch.model_construct(
+                brand=brand,
+                part_number=part_number,
+                confidence=round(confidence[node], 4),
+                hops=hops,
+                source=link.part.source,
+                order_count=link.part.order_count
+            ))
+        matches.sort(key=lambda match: -match.confidence)
+
+        self._cache.set(start, matches)
+        return matches
+
+    def clear(self) -> None:
+        self._links.clear()
+        self._names.clear()
+        self._by_part_number.clear()
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "parts": len(self._links),
+            "links": sum(len(links) for links in self._links.values()) // 2,
+            "cache": self._cache.stats(),
+        }
+
+
+equivalents_graph = EquivalentsGraph()
@@ -0,0 +1,126 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.cache import TTLCache
+
+
+# Largest edit budget any word gets; the index is built this deep
+MAX_DISTANCE = 2
+
+
+def _budget(length: int) -> int:
+    if length < 4:
+        return 0
+    if length < 8:
+        return 1
+    return MAX_DISTANCE
+
+
+def default_max_distance(word: str) -> int:
+    """Edit budget for a word: none for short words, where a typo is just another word."""
+    return _budget(len(word))
+
+
+def _deletes(word: str, depth: int) -> set:
+    """The word and every string made by deleting up to `depth` of its letters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent swaps).
+
+    Stops early once the distance must exceed `limit`, returning limit + 1.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant lookup over a fixed vocabulary, built once.
+
+    Every term is indexed under each string left after deleting up to its
+    edit budget of letters. Two words within k edits (a swap counts as one)
+    always share such a deletion variant, so a lookup generates the word's
+    own variants, collects the terms indexed under them with dict lookups,
+    and checks the edit distance on those few candidates. The cost depends
+    on the word's length, not on the size of the vocabulary.
+
+    Results are memoized (up to memo_size words), since the same few
+    unknown words ("anvil", "kit") come up again and again.
+    """
+
+    def __init__(self, terms: Iterable[str], memo_size: int = 4096):
+        self._memo = TTLCache(memo_size, 0)
+        self.terms: List[str] = list(dict.fromkeys(term.lower() for term in terms))
+        self._exact = set(self.terms)
+        self._variants: Dict[str, List[int]] = defaultdict(list)
+        for term_id, term in enumerate(self.terms):
+            # Deep enough for the budget of any word within reach of this term
+            for variant in _deletes(term, _budget(len(term) + 2)):
+                self._variants[variant].append(term_id)
+
+    def best(self, word: str, max_distance: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """
+        Closest term to `word` as (term, distance), or None if nothing is
+        within max_distance (default: default_max_distance(word); capped at
+        MAX_DISTANCE).
+
+        Ties go to the term listed first in the vocabulary.
+        """
+        word = word.lower()
+        if word in self._exact:
+            return (word, 0)
+
+        if max_distance is None:
+            max_distance = default_max_distance(word)
+        max_distance = min(max_distance, MAX_DISTANCE)
+        if max_distance <= 0:
+            return None
+
+        key = (word, max_distance)
+        best = self._memo.get(key, key)
+        if best is not key:
+            return best
+        best = self._search(word, max_distance)
+        self._memo.set(key, best)
+        return best
+
+    def _search(self, word: str, max_distance: int) -> Optional[Tuple[str, int]]:
+        candidates = set()
+        for variant in _deletes(word, max_distance):
+            candidates.update(self._variants.get(variant, ()))
+
+        best: Optional[Tuple[str, int]] = None
+        for term_id in sorted(candidates):
+            term = self.terms[term_id]
+            limit = best[1] - 1 if best else max_distance
+            distance = edit_distance(word, term, limit)
+            if distance <= limit:
+                best = (term, distance)
+                if distance == 1:
+                    break  # Can't do better than one edit (exact hits returned above)
+        return best
+
+    def __len__(self) -> int:
+        return len(self.terms)
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.repositories.storage import get_storage
+from app.services.response_cache import response_cache
+
+
+class HistoryWriter:
+    """
+    Buffers search_history documents and writes them in batches.
+
+    Searches enqueue their history entry and return without waiting on
+    storage. The buffer is flushed when it reaches settings.history_flush_size
+    or every settings.history_flush_interval_seconds, and drained on
+    shutdown. When it holds settings.history_buffer_size documents, new
+    ones are dropped and counted rather than slowing searches down.
+    """
+
+    def __init__(self):
+        self._buffer: List[Dict[str, Any]] = []
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    async def start(self) -> None:
+        """Start the periodic flusher (called from the app lifespan)."""
+        self._flush_requested = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def write(self, document: Dict[str, Any]) -> bool:
+        """Buffer one history document. Returns False if it was dropped."""
+        return self.write_many([document]) == 1
+
+    def write_many(self, documents: List[Dict[str, Any]]) -> int:
+        """Buffer several documents; returns how many were accepted."""
+        space = settings.history_buffer_size - len(self._buffer)
+        accepted = documents[:max(space, 0)]
+        self._buffer.extend(accepted)
+        self.dropped += len(documents) - len(accepted)
+
+        if self._flush_requested is not None and len(self._buffer) >= settings.history_flush_size:
+            self._flush_requested.set()
+        return len(accepted)
+
+    def clear(self) -> None:
+        """Forget buffered documents (history is being cleared anyway)."""
+        self._buffer.clear()
+
+    async def flush(self) -> None:
+        """Write everything buffered so far in one batch."""
+        if not self._buffer:
+            return
+
+        if self._lock is None:
+            await self._flush_once()
+            return
+
+        async with self._lock:
+            await self._flush_once()
+
+    async def _flush_once(self) -> None:
+        batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+
+        try:
+            failed = await get_storage().history.add_many(batch)
+        except Exception as e:
+            # Retried in full: documents that did get written come back as
+            # duplicates next time and count as written then
+            failed = batch
+            print(f"⚠️ Search history flush failed: {e}")
+        else:
+            if failed:
+                print(f"⚠️ Search history flush failed for {len(failed)} of {len(batch)} entries")
+
+        self.written += len(batch) - len(failed)
+        if len(failed) < len(batch):
+            # Other workers' cached history pages were built without this batch
+            response_cache.bump("history")
+        if failed:
+            self.failed_flushes += 1
+            # Retry on the next flush; whatever no longer fits counts as dropped
+            self.write_many(failed)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(),
+                    timeout=settings.history_flush_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+history_writer = HistoryWriter()
@@ -0,0 +1,246 @@
+import json
+import multiprocessing
+import random
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+
+
+# Upper bounds in seconds; search stages are sub-millisecond, vendors take seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Whether the request being handled was picked for timing (see sampled())
+_sampled: ContextVar[bool] = ContextVar("metrics_sampled", default=False)
+
+
+# Label sets one metric can hold across all workers; beyond this, new label
+# sets aren't recorded (every route, stage and vendor fits many times over)
+MAX_SERIES = 512
+
+# Longest label set, JSON-encoded
+KEY_BYTES = 256
+
+# Recording never waits longer than this for another worker to let go of a
+# metric; the observation is skipped instead
+LOCK_TIMEOUT_SECONDS = 0.05
+
+
+class _SharedSeries:
+    """
+    One row of `width` numbers per label set, in shared memory.
+
+    Created at import, so before gunicorn forks its workers: every worker
+    adds to the same rows, and /metrics reports the whole server whichever
+    worker answers the scrape (per-worker counters behind a load balancer
+    would jump up and down between scrapes, and break rate()). A row is
+    allocated by whichever process first records its label set; each
+    process keeps a private label set -> row map and catches up from the
+    shared key table when it meets a label set it doesn't know.
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self._values = multiprocessing.Array("d", MAX_SERIES * width)
+        self._lock = self._values.get_lock()
+        self._cells = self._values.get_obj()
+        self._keys = multiprocessing.Array("c", MAX_SERIES * KEY_BYTES, lock=False)
+        self._count = multiprocessing.Value("i", 0, lock=False)
+        self._rows: Dict[Labels, int] = {}
+
+    def _sync(self) -> None:
+        """Learn the rows other processes allocated (lock held)."""
+        for row in range(len(self._rows), self._count.value):
+            key = self._keys[row * KEY_BYTES:(row + 1) * KEY_BYTES].rstrip(b"\0")
+            self._rows[tuple(tuple(pair) for pair in json.loads(key))] = row
+
+    def _row(self, labels: Labels) -> Optional[int]:
+        """Row for a label set, allocated if new; None if the table is full (lock held)."""
+        row = self._rows.get(labels)
+        if row is not None:
+            return row
+
+        self._sync()
+        row = self._rows.get(labels)
+        if row is not None:
+            return row
+
+        key = json.dumps(labels).encode()
+        row = self._count.value
+        if row >= MAX_SERIES or len(key) > KEY_BYTES:
+            return None
+        self._keys[row * KEY_BYTES:row * KEY_BYTES + len(key)] = key
+        self._count.value = row + 1
+        self._rows[labels] = row
+        return row
+
+    def add(self, labels: Labels, *increments: Tuple[int, float]) -> None:
+        """Add each (column, amount) to the label set's row, atomically across workers."""
+        if not self._lock.acquire(timeout=LOCK_TIMEOUT_SECONDS):
+            return
+        try:
+            row = self._row(labels)
+            if row is None:
+                return
+            base = row * self.width
+            for column, amount in increments:
+                self._cells[base + column] += amount
+        finally:
+            self._lock.release()
+
+    def items(self) -> Iterator[Tuple[Labels, List[float]]]:
+        """Every label set and a copy of its row, sorted by labels."""
+        with self._lock:
+            self._sync()
+            rows = [
+                (labels, self._cells[row * self.width:(row + 1) * self.width])
+                for labels, row in self._rows.items()
+            ]
+        return iter(sorted(rows))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.bounds = ['le="%s"' % bound for bound in buckets] + ['le="+Inf"']
+        # Per label set: count per bucket (not cumulative; last is +Inf), then the sum
+        self._sum_column = len(buckets) + 1
+        self._series = _SharedSeries(len(buckets) + 2)
+
+    def observe(self, seconds: float, labels: Labels = ()) -> None:
+        self._series.add(labels, (bisect_left(self.buckets, seconds), 1), (self._sum_column, seconds))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, row in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.bounds, row):
+                cumulative += int(count)
+                lines.append(f"{self.name}_bucket{_format_labels(labels, bound)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_number(row[self._sum_column])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter, one series per label set."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._series = _SharedSeries(1)
+
+    def inc(self, labels: Labels = ()) -> None:
+        self._series.add(labels, (0, 1))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, (value,) in self._series.items():
+            lines.append(f"{self.name}{_format_labels(labels)} {int(value)}")
+        return lines
+
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests handled, by route and status (every request, sampled or not)."
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from request to end of response body, by route (sampled requests)."
+)
+STAGE_SECONDS = Histogram(
+    "search_stage_seconds",
+    "Time spent in each stage of a search, by route and stage (sampled requests)."
+)
+VENDOR_SECONDS = Histogram(
+    "vendor_pricing_seconds",
+    "Time to get a vendor's pricing, cache hits and timeouts included."
+)
+
+_METRICS = (REQUESTS, REQUEST_SECONDS, STAGE_SECONDS, VENDOR_SECONDS)
+
+
+def start_request() -> bool:
+    """
+    Decide whether the request starting now is timed.
+
+    With settings.metrics_sample_rate below 1, only that share of requests
+    pay for timing (a clock read per stage); the rest skip it entirely.
+    """
+    sampled = settings.metrics_enabled and (
+        settings.metrics_sample_rate >= 1 or random.random() < settings.metrics_sample_rate
+    )
+    _sampled.set(sampled)
+    return sampled
+
+
+def sampled() -> bool:
+    """Whether the current request is being timed."""
+    return _sampled.get()
+
+
+class span:
+    """
+    Time a block of a sampled request into a histogram:
+
+        with span("parse"):
+            parsed = QueryParser.parse(query)
+
+    A no-op (beyond the context variable lookup) for unsampled requests.
+    """
+
+    __slots__ = ("_labels", "_started")
+
+    def __init__(self, stage: str, route: str = "/api/search"):
+        self._labels: Labels = (("route", route), ("stage", stage))
+        self._started: Optional[float] = None
+
+    def __enter__(self) -> "span":
+        if _sampled.get():
+            self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._started is not None:
+            STAGE_SECONDS.observe(time.perf_counter() - self._started, self._labels)
+
+
+def observe_vendor(vendor: str, seconds: float) -> None:
+    """
+    Record a vendor's pricing time. Not sampled: next to a network round
+    trip the bookkeeping is free, and streamed pricing runs outside any
+    request.
+    """
+    if settings.metrics_enabled:
+        VENDOR_SECONDS.observe(seconds, (("vendor", vendor),))
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
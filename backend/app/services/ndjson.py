@@ -0,0 +1,117 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.responses import dumps
+
+MEDIA_TYPE = "application/x-ndjson"
+
+# Lines joined into one chunk of an export; one chunk per write to the socket
+EXPORT_CHUNK_LINES = 500
+
+# Documents handed to the repository per insert_many / bulk upsert
+IMPORT_BATCH_SIZE = 1000
+
+# A line longer than this is counted invalid and skipped without being buffered
+MAX_LINE_BYTES = 1024 * 1024
+
+# Invalid lines reported back individually (the rest are only counted)
+MAX_REPORTED_ERRORS = 10
+
+
+async def export_lines(documents: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """
+    Documents as NDJSON, one per line, EXPORT_CHUNK_LINES at a time.
+
+    Documents are written as stored (ObjectIds as strings), so an export
+    imports back unchanged.
+    """
+    lines = []
+    async for document in documents:
+        lines.append(dumps(document))
+        if len(lines) == EXPORT_CHUNK_LINES:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+class NDJSONImport:
+    """
+    Parses an NDJSON upload as it streams in, validating each line against
+    `model` and handing out documents IMPORT_BATCH_SIZE at a time.
+
+    Only the current batch and the line being read are held in memory, so
+    an upload's size doesn't matter. Invalid lines are counted, the first
+    MAX_REPORTED_ERRORS reported with their line number, and skipped.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.received = 0
+        self.invalid = 0
+        self.errors: List[str] = []
+
+    def _reject(self, line_number: int, reason: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"line {line_number}: {reason}")
+
+    def _parse(self, line_number: int, line: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            item = self.model.model_validate_json(line)
+        except ValidationError as e:
+            error = e.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            self._reject(line_number, f"{location}: {error['msg']}" if location else error["msg"])
+            return None
+
+        # Without an _id the repository assigns one
+        return item.model_dump(by_alias=True, exclude={"id"} if item.id is None else None)
+
+    async def batches(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[List[Dict[str, Any]]]:
+        batch: List[Dict[str, Any]] = []
+        pending = b""
+        line_number = 0
+        oversized = False
+
+        async def lines():
+            nonlocal pending, oversized
+            async for chunk in chunks:
+                *complete, pending = (pending + chunk).split(b"\n")
+                for line in complete:
+                    if oversized:
+                        # The tail of a line already rejected
+                        oversized = False
+                        continue
+                    yield line if len(line) <= MAX_LINE_BYTES else None
+
+                if len(pending) > MAX_LINE_BYTES:
+                    if not oversized:
+                        yield None
+                    oversized = True
+                    pending = b""
+            if pending and not oversized:
+                yield pending
+
+        async for line in lines():
+            line_number += 1
+            if line is None:
+                self.received += 1
+                self._reject(line_number, f"longer than {MAX_LINE_BYTES} bytes")
+                continue
+            if not line.strip():
+                continue
+
+            self.received += 1
+            document = self._parse(line_number, line)
+            if document is None:
+                continue
+
+            batch.append(document)
+            if len(batch) == IMPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
@@ -0,0 +1,210 @@
+import asyncio
+from bisect import insort
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.config import settings
+from app.models.schemas import OrderPattern, ParsedQuery
+from app.repositories.base import Document, Storage
+from app.services.parser import QueryParser
+from app.services.scraper import VendorScraper
+
+
+# Aggregation scopes, most specific first: ("part", brand, part),
+# ("brand", brand) and ("all",)
+Scope = Tuple[str, ...]
+
+# Favorites are paged through this many at a time when loading
+FAVORITES_PAGE_SIZE = 500
+
+
+class VendorStats(NamedTuple):
+    orders: int
+    median_price: Optional[float]
+
+
+def _median(prices: List[float]) -> Optional[float]:
+    """Median of an already sorted list."""
+    if not prices:
+        return None
+    middle = len(prices) // 2
+    if len(prices) % 2:
+        return prices[middle]
+    return round((prices[middle - 1] + prices[middle]) / 2, 2)
+
+
+def _favorite_weight(favorite: Document) -> int:
+    """Orders a favorite with a preferred vendor counts for."""
+    return max(favorite.get("times_ordered", 0), 1)
+
+
+def scopes_for(brand: Optional[str], part: Optional[str]) -> List[Scope]:
+    """Aggregation scopes a parsed query falls in, most specific first."""
+    scopes: List[Scope] = []
+    part_key = " ".join(part.lower().split()) if part else None
+    if part_key:
+        scopes.append(("part", brand or "", part_key))
+    if brand:
+        scopes.append(("brand", brand))
+    scopes.append(("all",))
+    return scopes
+
+
+class OrderRanking:
+    """
+    Ranks vendors by where parts were actually bought.
+
+    Orders (OrderPattern documents, plus favorites with a preferred vendor)
+    are counted per vendor at three scopes: the exact part for a brand, the
+    brand, and overall. New orders are queued and folded into the counts in
+    the background every settings.order_ranking_refresh_seconds; only the
+    scopes they touch are recomputed. Searches read a ready-made table, so
+    ranking costs a few dict lookups per vendor.
+    """
+
+    def __init__(self):
+        self._pending: List[Tuple[str, str, Optional[float], int]] = []
+        self._counts: Dict[Scope, Dict[str, int]] = {}
+        self._prices: Dict[Scope, Dict[str, List[float]]] = {}
+        self._table: Dict[Scope, Dict[str, VendorStats]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.orders = 0
+
+    async def start(self, storage: Storage) -> None:
+        """Load stored orders and favorites, then start the background refresher."""
+        try:
+            await self._load(storage)
+            print(f"✅ Ranking vendors from {len(self._pending)} orders")
+        except Exception as e:
+            print(f"⚠️ Order patterns not loaded: {e}")
+        self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def reload(self, storage: Storage) -> None:
+        """
+        Recount everything from storage (picking up orders recorded through
+        other workers) and swap the new table in.
+
+        Queued orders are dropped: they were stored before being queued, so
+        the recount has them (or the next one will).
+        """
+        fresh = OrderRanking()
+        await fresh._load(storage)
+        fresh.refresh()
+        self._counts, self._prices, self._table = fresh._counts, fresh._prices, fresh._table
+        self._pending = []
+        self.orders = fresh.orders
+
+    async def _load(self, storage: Storage) -> None:
+        async for document in storage.order_patterns.all():
+            pattern = OrderPattern(**document)
+            self.record(pattern.part_query, pattern.ordered_from, pattern.price_paid)
+
+        after = None
+        while True:
+            page = await storage.favorites.list(FAVORITES_PAGE_SIZE, after=after)
+            for favorite in page:
+                self.record_favorite(favorite)
+            if len(page) < FAVORITES_PAGE_SIZE:
+                break
+            after = (page[-1].get("last_ordered"), page[-1]["_id"])
+
+    def record(self, query: str, vendor: str, price: Optional[float] = None, weight: int = 1) -> bool:
+        """
+        Queue an order of `query` from `vendor` (key or display name).
+        It counts towards ranking after the next refresh. Returns False for
+        unknown vendors.
+        """
+        vendor_key = VendorScraper.vendor_key(vendor)
+        if vendor_key is None:
+            return False
+        self._pending.append((query, vendor_key, price, weight))
+        return True
+
+    def record_favorite(self, favorite: Optional[Document], previous: Optional[Document] = None) -> None:
+        """
+        Queue a favorite's preferred-vendor orders, weighted by times_ordered
+        (at least 1). `previous` is the favorite as stored before a change:
+        its orders are taken back, so an update or delete (favorite None)
+        leaves the counts the same as loading from storage would.
+        """
+        if previous and previous.get("preferred_vendor"):
+            self.record(previous["search_query"], previous["preferred_vendor"], weight=-_favorite_weight(previous))
+        if favorite and favorite.get("preferred_vendor"):
+            self.record(favorite["search_query"], favorite["preferred_vendor"], weight=_favorite_weight(favorite))
+
+    def refresh(self) -> int:
+        """Fold queued orders into the counts and rebuild the scopes they touch."""
+        pending, self._pending = self._pending, []
+        touched: Set[Scope] = set()
+
+        for query, vendor, price, weight in pending:
+            parsed = QueryParser.parse(query)
+            for scope in scopes_for(parsed.brand, parsed.part):
+                counts = self._counts.setdefault(scope, {})
+                counts[vendor] = counts.get(vendor, 0) + weight
+                if counts[vendor] <= 0:
+                    # Every order taken back (a favorite's vendor changed)
+                    del counts[vendor]
+                if price is not None:
+                    insort(self._prices.setdefault(scope, {}).setdefault(vendor, []), price)
+                touched.add(scope)
+            self.orders += weight
+
+        # Copy-on-write so searches never see a half-updated table
+        if touched:
+            table = dict(self._table)
+            for scope in touched:
+                prices = self._prices.get(scope, {})
+                table[scope] = {
+                    vendor: VendorStats(orders, _median(prices.get(vendor, [])))
+                    for vendor, orders in self._counts[scope].items()
+                }
+            self._table = table
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.order_ranking_refresh_seconds)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Order ranking refresh failed: {e}")
+
+    def rank(self, parsed: ParsedQuery, vendors: List[str]) -> List[str]:
+        """
+        Vendor keys reordered so the ones most ordered from come first:
+        by orders for this part, then this brand, then overall. Vendors
+        never ordered from keep their requested order, after the rest.
+        """
+        tables = [self._table.get(scope, {}) for scope in scopes_for(parsed.brand, parsed.part)]
+        if not any(tables):
+            return vendors
+
+        def key(vendor: str) -> Tuple[int, ...]:
+            return tuple(-table[vendor].orders if vendor in table else 0 for table in tables)
+
+        return sorted(vendors, key=key)
+
+    def summary(self, parsed: ParsedQuery) -> Tuple[Optional[str], Dict[str, VendorStats]]:
+        """Vendor stats at the most specific scope with orders, as (scope name, stats)."""
+        for scope in scopes_for(parsed.brand, parsed.part):
+            stats = self._table.get(scope)
+            if stats:
+                return scope[0], stats
+        return None, {}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "orders": self.orders,
+            "pending": len(self._pending),
+            "scopes": len(self._table),
+        }
+
+
+order_ranking = OrderRanking()
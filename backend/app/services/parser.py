@@ -1,12 +1,34 @@
 import re
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
+from app.config import settings
 from app.models.schemas import ParsedQuery
+from app.services.cache import TTLCache
+from app.services.fuzzy import FuzzyIndex
+
+
+# Token labels assigned by QueryParser._classify
+BRAND = "brand"
+MODEL = "model"
+TOOL_TYPE = "tool_type"
+PART = "part"
+
+# Brand aliases shorter than this are only fuzzy-matched next to a model or
+# part token: one edit from "bosch" or "senco" is often an ordinary word ("boss")
+SHORT_ALIAS_LENGTH = 6
 
 
 class QueryParser:
-    """Parse search queries to extract brand, model, and part information."""
+    """
+    Parse search queries to extract brand, model, and part information.
 
-    # Common pneumatic and power tool brands (with common misspellings)
+    The vocabulary tables below are compiled into matchers, and parse
+    results cached, at import. Change them through add_brand, add_tool_type
+    and add_part, or call reload() after editing them directly; otherwise
+    the parser keeps serving the old vocabulary.
+    """
+
+    # Common pneumatic and power tool brands (with common misspellings).
+    # Extend with add_brand(), or call reload() after editing.
     BRANDS = [
         "ingersoll rand", "ir", "ingersol", "ingersoll",
         "chicago pneumatic", "cp",
@@ -32,7 +54,27 @@ class QueryParser:
         "hilti",
     ]
 
-    # Tool types for context
+    # Canonical names for aliases that don't normalize with str.title()
+    # (add_brand(alias, canonical), or reload() after editing)
+    BRAND_NORMALIZATION = {
+        "ingersoll rand": "Ingersoll Rand", "ir": "Ingersoll Rand",
+        "ingersol": "Ingersoll Rand", "ingersoll": "Ingersoll Rand",
+        "chicago pneumatic": "Chicago Pneumatic", "cp": "Chicago Pneumatic",
+        "snap-on": "Snap-on", "snap on": "Snap-on", "snapon": "Snap-on",
+        "mac tools": "Mac Tools", "mac": "Mac Tools",
+        "dewalt": "Dewalt", "de walt": "Dewalt", "dwalt": "Dewalt",
+        "makita": "Makita", "makitta": "Makita", "maketa": "Makita",
+        "milwaukee": "Milwaukee", "milwakee": "Milwaukee", "milwaukie": "Milwaukee",
+        "bosch": "Bosch", "bosh": "Bosch",
+        "porter cable": "Porter Cable", "porter-cable": "Porter Cable",
+        "campbell hausfeld": "Campbell Hausfeld",
+        "hitachi": "Hitachi", "hikoki": "Hitachi",
+        "ridgid": "Ridgid", "rigid": "Ridgid",
+        "black+decker": "Black+Decker", "black and decker": "Black+Decker",
+        "b+d": "Black+Decker",
+    }
+
+    # Tool types for context (add_tool_type(), or reload() after editing)
     TOOL_TYPES = [
         "grinder", "angle grinder", "die grinder",
         "drill", "impact drill", "hammer drill", "rotary hammer",
@@ -45,7 +87,7 @@ class QueryParser:
         "compressor", "air compressor",
     ]
 
-    # Common parts and their synonyms
+    # Common parts and their synonyms (add_part(), or reload() after editing)
     PART_SYNONYMS = {
         "brush": ["carbon brush", "motor brush"],
         "switch": ["on off switch", "power switch", "trigger switch"],
@@ -62,6 +104,23 @@ class QueryParser:
         "vane": ["rotor vane", "carbon vane"],
     }
 
+    # Model number patterns, most specific first. Fused into one alternation
+    # so a single scan finds the same match as trying each in order; call
+    # reload() after editing.
+    MODEL_PATTERNS = [
+        ("hyphenated", r'[A-Z]{2,4}-\d{2,5}[A-Z]?'),  # CB-440, IR-2135, DTD-152
+        ("alphanumeric", r'[A-Z]{2,4}\d{3,5}[A-Z]?'),  # DTD152, DWE402, CB440
+        ("prefixed", r'[A-Z]{2}\d{4,6}'),  # N123456, CB440
+        ("numeric", r'\d{3,5}[A-Z]?'),  # 2135, 894A, 12345 (least specific, try last)
+    ]
+
+    # Query tokens: runs of letters, digits and "+" ("b+d"); anything else separates
+    _TOKEN = re.compile(r"[a-z0-9+]+")
+
+    # Query as typed -> ParsedQuery, and parsed fields -> search string
+    _parse_cache = TTLCache(settings.parser_cache_size, settings.parser_cache_ttl_seconds)
+    _search_query_cache = TTLCache(settings.parser_cache_size, settings.parser_cache_ttl_seconds)
+
     @classmethod
     def parse(cls, query: str) -> ParsedQuery:
         """
@@ -73,99 +132,322 @@ class QueryParser:
         - "makita brush" → brand: Makita, part: brush
         - "impact driver switch" → tool type + part
         """
-        query_lower = query.lower().strip()
+        # Keyed as typed, so a hit is the (frozen) result itself, raw_query
+        # included; copying a cached result for another spelling costs
+        # about as much as a third of classifying it
+        parsed = cls._parse_cache.get(query)
+        if parsed is not None:
+            return parsed
 
-        brand, brand_matched = cls._extract_brand(query_lower)
-        model = cls._extract_model(query_lower)
-        part = cls._extract_part(query_lower, brand_matched, model)
+        brand, model, part = cls._classify(query.lower().strip())
 
-        return ParsedQuery(
+        parsed = ParsedQuery(
             brand=brand,
             model=model,
             part=part,
             raw_query=query
         )
+        cls._parse_cache.set(query, parsed)
+        return parsed
+
+    @staticmethod
+    def _offsets(query: str, texts: List[str]) -> List[int]:
+        """Start offset of each token (in order) within the query."""
+        starts = []
+        position = 0
+        for text in texts:
+            position = query.find(text, position)
+            starts.append(position)
+            position += len(text)
+        return starts
 
     @classmethod
-    def _extract_brand(cls, query: str) -> tuple[Optional[str], Optional[str]]:
+    def _classify(cls, query: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
         """
-        Extract brand name from query (with fuzzy matching for misspellings).
-        Returns: (normalized_brand_name, original_matched_text)
+        Brand, model and part from a single tokenization of the query.
+
+        Token runs are looked up, longest first, in one table of brand
+        aliases, tool types and part names (indexed by first word, so most
+        tokens cost a single dict miss). The longest brand alias wins
+        ("mac tools" over "mac"); when none matches, the fuzzy indexes get a
+        turn at the words left over. The model comes from the fused model
+        regex and claims its whole space-delimited chunk ("2767" takes
+        "2767-20"). Whatever is left, minus tool types, is the part, with its
+        original spelling ("o-ring").
         """
-        for brand in cls.BRANDS:
-            if brand in query:
-                # Normalize brand names (including misspellings)
-                normalized = None
-                if brand in ["ingersoll rand", "ir", "ingersol", "ingersoll"]:
-                    normalized = "Ingersoll Rand"
-                elif brand in ["chicago pneumatic", "cp"]:
-                    normalized = "Chicago Pneumatic"
-                elif brand in ["snap-on", "snap on", "snapon"]:
-                    normalized = "Snap-on"
-                elif brand in ["mac tools", "mac"]:
-                    normalized = "Mac Tools"
-                elif brand in ["dewalt", "de walt", "dwalt"]:
-                    normalized = "Dewalt"
-                elif brand in ["makita", "makitta", "maketa"]:
-                    normalized = "Makita"
-                elif brand in ["milwaukee", "milwakee", "milwaukie"]:
-                    normalized = "Milwaukee"
-                elif brand in ["bosch", "bosh"]:
-                    normalized = "Bosch"
-                elif brand in ["porter cable", "porter-cable"]:
-                    normalized = "Porter Cable"
-                elif brand in ["campbell hausfeld"]:
-                    normalized = "Campbell Hausfeld"
-                elif brand in ["hitachi", "hikoki"]:
-                    normalized = "Hitachi"
-                elif brand in ["ridgid", "rigid"]:
-                    normalized = "Ridgid"
-                elif brand in ["black+decker", "black and decker", "b+d"]:
-                    normalized = "Black+Decker"
-                else:
-                    normalized = brand.title()
+        texts = cls._TOKEN.findall(query)
+        count = len(texts)
+        labels: List[Optional[str]] = [None] * count
+
+        brand = None
+        brand_run = None
+        brand_length = 0
+        i = 0
+        while i < count:
+            candidates = cls._PHRASE_STARTS.get(texts[i])
+            if candidates is None:
+                i += 1
+                continue
+
+            # Longest phrase starting here wins
+            for words, kind, value, length in candidates:
+                n = len(words)
+                if n == 1 or texts[i:i + n] == words:
+                    break
+            else:
+                i += 1
+                continue
+
+            if kind == BRAND:
+                if length > brand_length:
+                    brand, brand_run, brand_length = value, (i, n), length
+            else:
+                labels[i:i + n] = [kind] * n
+            i += n
+
+        if brand is None:
+            brand, brand_run = cls._fuzzy_brand(texts, labels)
+        if brand_run is not None:
+            start, n = brand_run
+            labels[start:start + n] = [BRAND] * n
+
+        if None in labels:
+            cls._fuzzy_tool_types(texts, labels)
 
-                return (normalized, brand)  # Return both normalized name and original match
-        return (None, None)
+        model = cls._extract_model(query)
+        if model is None and None not in labels and PART not in labels:
+            return (brand, None, None)
+
+        starts = cls._offsets(query, texts)
+
+        if model is not None:
+            model_start = cls._find_word(query, model.lower())
+            if model_start >= 0:
+                chunk_start = query.rfind(" ", 0, model_start) + 1
+                chunk_end = query.find(" ", model_start + len(model))
+                if chunk_end < 0:
+                    chunk_end = len(query)
+                for j in range(count):
+                    if labels[j] is None and chunk_start <= starts[j] < chunk_end:
+                        labels[j] = MODEL
+
+        # The part: runs of unclaimed tokens (and part names), as typed
+        runs = []
+        run_start = None
+        for j in range(count):
+            if labels[j] is None or labels[j] == PART:
+                if run_start is None:
+                    run_start = starts[j]
+                run_end = starts[j] + len(texts[j])
+            elif run_start is not None:
+                runs.append(" ".join(query[run_start:run_end].split()))
+                run_start = None
+        if run_start is not None:
+            runs.append(" ".join(query[run_start:run_end].split()))
+
+        return (brand, model, " ".join(runs) or None)
+
+    @staticmethod
+    def _find_word(query: str, word: str) -> int:
+        """Offset of `word` in the query where it isn't part of a longer word, or -1."""
+        start = query.find(word)
+        while start >= 0:
+            end = start + len(word)
+            before = query[start - 1] if start else " "
+            after = query[end] if end < len(query) else " "
+            if not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_"):
+                return start
+            start = query.find(word, start + 1)
+        return -1
 
     @classmethod
-    def _extract_model(cls, query: str) -> Optional[str]:
-        """Extract model number from query."""
-        # Look for model patterns: numbers, alphanumeric codes
-        # Order matters - try more specific patterns first
-        patterns = [
-            r'\b([A-Z]{2,4}-\d{2,5}[A-Z]?)\b',  # CB-440, IR-2135, DTD-152
-            r'\b([A-Z]{2,4}\d{3,5}[A-Z]?)\b',  # DTD152, DWE402, CB440
-            r'\b([A-Z]{2}\d{4,6})\b',  # N123456, CB440
-            r'\b(\d{3,5}[A-Z]?)\b',  # 2135, 894A, 12345 (least specific, try last)
+    def _fuzzy_brand(cls, texts: List[str], labels: List[Optional[str]]) -> tuple[Optional[str], Optional[tuple]]:
+        """
+        Closest brand to any unclaimed word (or pair of words), for typos the
+        alias list doesn't cover ("milwauke", "dewlat", "festoll"). Words
+        that are tool types or parts are left alone, and a misspelling of a
+        short alias only counts next to a model or part token ("bosh brush",
+        not "boss"). Returns the canonical brand and the (start, length)
+        token run it matched.
+        """
+        usable = [
+            labels[j] is None and texts[j].isalpha() and texts[j] not in cls._KNOWN_WORDS
+            for j in range(len(texts))
         ]
 
-        for pattern in patterns:
-            match = re.search(pattern, query.upper())
-            if match:
-                return match.group(1)
-        return None
+        def anchored(j: int) -> bool:
+            return 0 <= j < len(texts) and (labels[j] == PART or any(c.isdigit() for c in texts[j]))
+
+        best = None
+        for n in (1, 2):
+            for j in range(len(texts) - n + 1):
+                if not all(usable[j:j + n]):
+                    continue
+                match = cls._BRAND_FUZZY.best(" ".join(texts[j:j + n]))
+                if match is None:
+                    continue
+                alias, distance = match
+                if distance and len(alias) < SHORT_ALIAS_LENGTH and not (anchored(j - 1) or anchored(j + n)):
+                    continue
+                if best is None or distance < best[0]:
+                    best = (distance, alias, (j, n))
+
+        if best is None:
+            return (None, None)
+        _, alias, run = best
+        return (cls._BRAND_LOOKUP[alias], run)
 
     @classmethod
-    def _extract_part(cls, query: str, brand: Optional[str], model: Optional[str]) -> Optional[str]:
-        """Extract part description from query."""
-        # Remove brand and model from query to get part description
-        remaining = query
+    def _fuzzy_tool_types(cls, texts: List[str], labels: List[Optional[str]]) -> None:
+        """
+        Label misspelled tool types: pairs next to a tool-type word first
+        ("impcat wrench", even if "wrench" alone already matched, or "angle
+        grindr"), then unknown single words ("grindr", "drills").
 
-        if brand:
-            remaining = remaining.replace(brand.lower(), "").strip()
+        A single word is only taken when it's the tool type plus a suffix
+        ("drills") or keeps its first and last letters ("grindr"): words
+        one edit from a tool type at the end are usually part names of
+        their own ("drive", "driven", "staples", "compressed").
+        """
+        known = cls._KNOWN_WORDS
+        for j in range(len(texts) - 1):
+            first, second = texts[j], texts[j + 1]
+            if labels[j] not in (None, TOOL_TYPE) or labels[j + 1] not in (None, TOOL_TYPE):
+                continue
+            if labels[j] == labels[j + 1] == TOOL_TYPE:
+                continue
+            if (first in known or second in known) and first.isalpha() and second.isalpha():
+                if cls.match_tool_type(f"{first} {second}"):
+                    labels[j] = labels[j + 1] = TOOL_TYPE
 
-        if model:
-            remaining = remaining.replace(model.lower(), "").strip()
+        for j, word in enumerate(texts):
+            if labels[j] is None and len(word) >= 4 and word not in known and word.isalpha():
+                tool_type = cls.match_tool_type(word)
+                if tool_type and cls._tool_type_variant(word, tool_type):
+                    labels[j] = TOOL_TYPE
 
-        # Remove tool types from remaining to get just the part
-        for tool_type in cls.TOOL_TYPES:
-            remaining = remaining.replace(tool_type, "").strip()
+    @staticmethod
+    def _tool_type_variant(word: str, tool_type: str) -> bool:
+        """Whether a word near `tool_type` is that tool type, plural or misspelled inside."""
+        return word.startswith(tool_type) or (word[0] == tool_type[0] and word[-1] == tool_type[-1])
 
-        # Clean up extra spaces
-        remaining = re.sub(r'\s+', ' ', remaining).strip()
+    @classmethod
+    def normalize_brand(cls, brand: str) -> str:
+        """Canonical name for a brand alias ("ir" -> "Ingersoll Rand"); unknown brands unchanged."""
+        return cls._BRAND_LOOKUP.get(brand.strip().lower(), brand.strip())
 
-        return remaining if remaining else None
+    @classmethod
+    def match_part(cls, word: str) -> Optional[str]:
+        """PART_SYNONYMS key closest to a (possibly misspelled) part word."""
+        match = cls._PART_FUZZY.best(word)
+        return match[0] if match else None
+
+    @classmethod
+    def match_tool_type(cls, text: str) -> Optional[str]:
+        """TOOL_TYPES entry closest to a (possibly misspelled) tool type."""
+        match = cls._TOOL_TYPE_FUZZY.best(text)
+        return match[0] if match else None
+
+    @classmethod
+    def add_brand(cls, alias: str, canonical: Optional[str] = None) -> None:
+        """Recognize a brand alias, normalized to `canonical` (default: alias.title())."""
+        alias = alias.lower()
+        if alias not in cls.BRANDS:
+            cls.BRANDS.append(alias)
+        if canonical is not None:
+            cls.BRAND_NORMALIZATION[alias] = canonical
+        cls.reload()
+
+    @classmethod
+    def add_tool_type(cls, tool_type: str) -> None:
+        """Recognize a tool type (left out of the part)."""
+        tool_type = tool_type.lower()
+        if tool_type not in cls.TOOL_TYPES:
+            cls.TOOL_TYPES.append(tool_type)
+        cls.reload()
+
+    @classmethod
+    def add_part(cls, part: str, synonyms: Iterable[str] = ()) -> None:
+        """Recognize a part name, with synonyms searched for it."""
+        known = cls.PART_SYNONYMS.setdefault(part.lower(), [])
+        known.extend(synonym.lower() for synonym in synonyms if synonym.lower() not in known)
+        cls.reload()
+
+    @classmethod
+    def reload(cls) -> None:
+        """
+        Precompile the lookup tables and regexes derived from the vocabulary.
+        Call after changing BRANDS, BRAND_NORMALIZATION, MODEL_PATTERNS,
+        TOOL_TYPES or PART_SYNONYMS, in place or by reassignment.
+
+        Brand aliases, tool types and part names go into one table keyed by
+        their tokens, so the tokenizer classifies a query with dict lookups;
+        each also gets a FuzzyIndex for misspellings. Model patterns are
+        fused into one regex.
+
+        Any cached parse results are dropped, since they were computed from
+        the previous tables.
+        """
+        cls._BRAND_LOOKUP = {
+            brand: cls.BRAND_NORMALIZATION.get(brand, brand.title())
+            for brand in cls.BRANDS
+        }
+
+        # Token run -> (label, value); brands win over tool types over parts
+        def key(phrase: str) -> tuple:
+            return tuple(cls._TOKEN.findall(phrase))
+
+        part_phrases = [*cls.PART_SYNONYMS]
+        for synonyms in cls.PART_SYNONYMS.values():
+            part_phrases.extend(synonyms)
+        phrases = {key(phrase): (PART, phrase) for phrase in part_phrases}
+        phrases.update({key(tool_type): (TOOL_TYPE, tool_type) for tool_type in cls.TOOL_TYPES})
+        phrases.update({key(alias): (BRAND, brand) for alias, brand in cls._BRAND_LOOKUP.items()})
+
+        # First word -> [(words, label, value, phrase length)], longest first
+        cls._PHRASE_STARTS = {}
+        for words, (label, value) in sorted(phrases.items(), key=lambda item: -len(item[0])):
+            cls._PHRASE_STARTS.setdefault(words[0], []).append(
+                (list(words), label, value, len(" ".join(words)))
+            )
+
+        # Words that are never fuzzy-matched (they're already vocabulary)
+        cls._KNOWN_WORDS = {
+            word
+            for words, (label, _) in phrases.items() if label != BRAND
+            for word in words
+        }
+
+        cls._BRAND_FUZZY = FuzzyIndex(cls._BRAND_LOOKUP)
+        cls._TOOL_TYPE_FUZZY = FuzzyIndex(cls.TOOL_TYPES)
+        cls._PART_FUZZY = FuzzyIndex(cls.PART_SYNONYMS)
+        cls._MODEL_PATTERN = re.compile(
+            r'\b(?:' + "|".join(f"(?P<{name}>{pattern})" for name, pattern in cls.MODEL_PATTERNS) + r')\b'
+        )
+
+        cls._parse_cache.clear()
+        cls._search_query_cache.clear()
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """Hit/miss counters for the parse and search-query caches."""
+        return {
+            "parse": cls._parse_cache.stats(),
+            "search_query": cls._search_query_cache.stats(),
+        }
+
+    @classmethod
+    def _extract_model(cls, query: str) -> Optional[str]:
+        """Extract model number from query."""
+        # Each match fills exactly one group, so walking the groups in
+        # pattern order reproduces the original one-search-per-pattern cascade
+        matches = cls._MODEL_PATTERN.findall(query.upper())
+
+        for rank in range(len(cls.MODEL_PATTERNS)):
+            for groups in matches:
+                if groups[rank]:
+                    return groups[rank]
+        return None
 
     @classmethod
     def build_search_query(cls, parsed: ParsedQuery) -> str:
@@ -178,6 +460,16 @@ class QueryParser:
         - Part only: "carbon brush"
         - Model only: "DTD152"
         """
+        key = (parsed.brand, parsed.model, parsed.part, parsed.raw_query)
+        query = cls._search_query_cache.get(key)
+        if query is None:
+            query = cls._build_search_query(parsed)
+            cls._search_query_cache.set(key, query)
+        return query
+
+    @classmethod
+    def _build_search_query(cls, parsed: ParsedQuery) -> str:
+        """Uncached body of build_search_query."""
         components = []
 
         if parsed.brand:
@@ -194,6 +486,10 @@ class QueryParser:
                         # For short searches, keep it simple
                         part = key
                         break
+                else:
+                    # Misspelled part name ("bearng", "sprng")
+                    if part.lower() not in cls._KNOWN_WORDS:
+                        part = cls.match_part(part) or part
             components.append(part)
 
         # Build the query
@@ -210,3 +506,6 @@ class QueryParser:
                 query += " parts"
 
         return query
+
+
+QueryParser.reload()
@@ -0,0 +1,192 @@
+import asyncio
+import importlib.util
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+# Only the first few listings are relevant; later ones drift to accessories
+MAX_PRICES_PER_PAGE = 10
+
+_AMOUNT = re.compile(r'(\d{1,3}(?:,\d{3})*\.\d{2})')
+
+
+def _price_range(amounts: List[str]) -> Optional[Dict[str, float]]:
+    """Turn matched price strings into {"min", "max"}, ignoring zero prices."""
+    prices = [float(amount.replace(",", "")) for amount in amounts[:MAX_PRICES_PER_PAGE]]
+    prices = [price for price in prices if price > 0]
+    if not prices:
+        return None
+    return {"min": min(prices), "max": max(prices)}
+
+
+def _block_extractor(
+    block_pattern: str, exclude: Optional[str] = None
+) -> Callable[[str], Optional[Dict[str, float]]]:
+    """
+    Extractor that reads every amount inside blocks matching block_pattern,
+    after removing anything matching exclude (e.g. struck-out old prices).
+    """
+    blocks = re.compile(block_pattern, re.DOTALL)
+    excluded = re.compile(exclude, re.DOTALL) if exclude else None
+
+    def extract(html: str) -> Optional[Dict[str, float]]:
+        if excluded is not None:
+            html = excluded.sub("", html)
+        amounts = []
+        for block in blocks.findall(html):
+            amounts.extend(_AMOUNT.findall(block))
+        return _price_range(amounts)
+
+    return extract
+
+
+def _attribute_extractor(attribute_pattern: str) -> Callable[[str], Optional[Dict[str, float]]]:
+    """Extractor for prices carried in a single captured attribute or text node."""
+    pattern = re.compile(attribute_pattern)
+
+    def extract(html: str) -> Optional[Dict[str, float]]:
+        return _price_range(pattern.findall(html))
+
+    return extract
+
+
+# Per-vendor search page parsers: HTML -> {"min", "max"} or None.
+# Vendors whose results are rendered client-side (Canadian Tire, Home Depot)
+# or that aren't stores (search engines, YouTube) have no extractor.
+PRICE_EXTRACTORS: Dict[str, Callable[[str], Optional[Dict[str, float]]]] = {
+    # "C $24.99" or "C $10.00<span class="DEFAULT"> to </span>C $20.00"
+    "ebay": _block_extractor(r'<span class="s-item__price">((?:[^<]|<span[^>]*>[^<]*</span>)*)</span>'),
+    # Selling price only, not the struck-out "List:" price (class "a-price a-text-price")
+    "amazon": _attribute_extractor(
+        r'<span class="a-price"[^>]*><span class="a-offscreen">\$(\d{1,3}(?:,\d{3})*\.\d{2})</span>'
+    ),
+    # Magento: final price only, not the "Regular Price" (oldPrice) of items on special
+    "kms_tools": _attribute_extractor(r'data-price-amount="(\d+(?:\.\d+)?)"\s+data-price-type="finalPrice"'),
+    # WooCommerce: sale items carry their old price in <del>
+    "contractor_cave": _block_extractor(
+        r'<span class="woocommerce-Price-amount amount">(.*?)</bdi>', exclude=r'<del\b.*?</del>'
+    ),
+    "canada_tool_parts": _block_extractor(
+        r'<span class="woocommerce-Price-amount amount">(.*?)</bdi>', exclude=r'<del\b.*?</del>'
+    ),
+}
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class PricingEngine:
+    """
+    Fetches vendor search pages over one shared, pooled HTTP client.
+
+    Requests are limited per host by a semaphore (concurrency) and a token
+    bucket (rate), so a burst of searches can't get us blocked.
+
+    host_overrides maps a vendor host to another origin, e.g.
+    {"www.ebay.ca": "http://127.0.0.1:9000"}, to replay saved vendor pages
+    from a local fixture server.
+    """
+
+    def __init__(
+        self,
+        host_overrides: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.host_overrides = {host: httpx.URL(origin) for host, origin in (host_overrides or {}).items()}
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the shared client on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=settings.pricing_max_connections,
+                    max_keepalive_connections=settings.pricing_max_connections,
+                    keepalive_expiry=30.0,
+                ),
+                timeout=httpx.Timeout(settings.vendor_timeout_seconds),
+                headers={"User-Agent": USER_AGENT, "Accept-Language": "en-CA,en;q=0.9"},
+                follow_redirects=True,
+                transport=self._transport,
+            )
+        return self._client
+
+    def _limits_for(self, host: str) -> tuple[asyncio.Semaphore, TokenBucket]:
+        """Per-host concurrency semaphore and rate limiter, created on demand."""
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(settings.pricing_per_host_concurrency)
+            self._buckets[host] = TokenBucket(settings.pricing_requests_per_second, settings.pricing_burst)
+        return self._semaphores[host], self._buckets[host]
+
+    async def fetch_pricing(self, vendor: str, url: str) -> Optional[Dict[str, float]]:
+        """
+        Fetch a vendor search page and extract its price range.
+
+        Returns None for vendors without an extractor or pages with no
+        prices. HTTP errors are raised to the caller.
+        """
+        extractor = PRICE_EXTRACTORS.get(vendor)
+        if extractor is None:
+            return None
+
+        request_url = httpx.URL(url)
+        host = request_url.host
+        override = self.host_overrides.get(host)
+        if override is not None:
+            request_url = request_url.copy_with(scheme=override.scheme, host=override.host, port=override.port)
+
+        semaphore, bucket = self._limits_for(host)
+        async with semaphore:
+            await bucket.acquire()
+            response = await self._get_client().get(request_url)
+
+        response.raise_for_status()
+        return extractor(response.text)
+
+    async def close(self) -> None:
+        """Close pooled connections (called on shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+pricing_engine = PricingEngine()
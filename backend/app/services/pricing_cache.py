@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.repositories.storage import get_storage
+from app.services.cache import TTLCache
+
+
+Pricing = Optional[Dict[str, float]]
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a search query: lowercase, single-spaced."""
+    return " ".join(query.lower().split())
+
+
+class PricingCache:
+    """
+    Two-tier pricing cache keyed by (vendor, normalized search query).
+
+    An in-process LRU sits in front of the storage backend's pricing cache,
+    which drops entries after settings.cache_expiry_days. Entries older
+    than settings.pricing_fresh_days are still served, but trigger a
+    background refresh (stale-while-revalidate).
+
+    "No prices on the page" is cached like any other result; fetch errors
+    are not.
+    """
+
+    def __init__(self):
+        self._memory = TTLCache(settings.pricing_cache_size, settings.cache_expiry_days * 86400)
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def fresh_for(self) -> timedelta:
+        return timedelta(days=settings.pricing_fresh_days)
+
+    async def get_or_fetch(
+        self,
+        vendor: str,
+        query: str,
+        fetch: Callable[[], Awaitable[Pricing]]
+    ) -> Pricing:
+        """Return cached pricing (refreshing it if stale) or fetch and store it."""
+        key = (vendor, normalize_query(query))
+
+        cached = await self._get(key)
+        if cached is not None:
+            pricing, fetched_at = cached
+            if datetime.utcnow() - fetched_at > self.fresh_for:
+                self._refresh_in_background(key, fetch)
+            return pricing
+
+        pricing = await fetch()
+        await self._set(key, pricing)
+        return pricing
+
+    async def _get(self, key: Tuple[str, str]) -> Optional[Tuple[Pricing, datetime]]:
+        """Look in memory, then storage. A storage error counts as a miss."""
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached
+
+        storage = get_storage()
+        if storage is None:
+            return None
+
+        try:
+            doc = await storage.pricing_cache.get(*key)
+        except Exception:
+            return None
+
+        if doc is None:
+            return None
+
+        cached = (doc.get("pricing"), doc["fetched_at"])
+        self._memory.set(key, cached)
+        return cached
+
+    async def _set(self, key: Tuple[str, str], pricing: Pricing) -> None:
+        """Store in memory and in storage."""
+        fetched_at = datetime.utcnow()
+        self._memory.set(key, (pricing, fetched_at))
+
+        storage = get_storage()
+        if storage is None:
+            return
+
+        try:
+            await storage.pricing_cache.put(*key, pricing, fetched_at)
+        except Exception as e:
+            print(f"⚠️ Pricing cache write failed: {e}")
+
+    def _refresh_in_background(self, key: Tuple[str, str], fetch: Callable[[], Awaitable[Pricing]]) -> None:
+        """Re-fetch a stale entry without blocking the caller (once per key)."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                pricing = await asyncio.wait_for(fetch(), timeout=settings.vendor_timeout_seconds)
+                await self._set(key, pricing)
+            except Exception:
+                pass  # Keep serving the stale entry; retry on a later search
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """In-process tier counters."""
+        return {**self._memory.stats(), "refreshing": len(self._refreshing)}
+
+
+pricing_cache = PricingCache()
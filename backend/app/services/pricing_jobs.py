@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+
+from app.config import settings
+from app.models.schemas import VendorResult
+from app.services.scraper import VendorScraper
+
+
+class PricingJob(NamedTuple):
+    """Scrape one vendor's pricing for one streamed search."""
+    search_id: str
+    index: int  # Position of the result in the search response
+    vendor: str
+    query: str
+
+
+class SearchStream:
+    """Pricing updates for one search, buffered until the client reads them."""
+
+    def __init__(self, results: List[VendorResult]):
+        self.results = results
+        self.pending = 0
+        self.created = time.monotonic()
+        self.updates: asyncio.Queue = asyncio.Queue()
+
+
+class PricingJobQueue:
+    """
+    Bounded queue of vendor pricing jobs drained by an in-process worker pool.
+
+    A streamed search returns its instant URLs straight away; each priced
+    vendor becomes a job, and finished jobs are pushed to the search's
+    stream for GET /api/search/{search_id}/stream to relay as SSE.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._streams: Dict[str, SearchStream] = {}
+
+    async def start(self) -> None:
+        """Start the worker pool (called from the app lifespan)."""
+        self._queue = asyncio.Queue(maxsize=settings.pricing_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(settings.pricing_workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued jobs are dropped."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, query: str, vendors: List[str], results: List[VendorResult]) -> Optional[str]:
+        """
+        Queue pricing for every result whose vendor has a scraper.
+
+        `vendors` are the vendor keys matching `results` one-to-one. Queued
+        results are marked "processing" in place. Returns the search id to
+        stream from, or None if nothing was queued (queue full or no priced
+        vendors); those results simply keep their instant URL.
+        """
+        if self._queue is None:
+            return None
+
+        self._expire_streams()
+        search_id = uuid.uuid4().hex
+        stream = SearchStream(results)
+
+        for index, (vendor, result) in enumerate(zip(vendors, results)):
+            if vendor not in VendorScraper.PRICING_VENDORS:
+                continue
+            try:
+                self._queue.put_nowait(PricingJob(search_id, index, vendor, query))
+            except asyncio.QueueFull:
+                break
+
+            result.method = "scraping"
+            result.status = "processing"
+            result.eta = f"{max(1, round(settings.vendor_timeout_seconds))}s"
+            stream.pending += 1
+
+        if not stream.pending:
+            return None
+
+        self._streams[search_id] = stream
+        return search_id
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                pricing = await VendorScraper._scrape_with_timeout(job.vendor, job.query)
+
+                stream = self._streams.get(job.search_id)
+                if stream is not None:
+                    result = stream.results[job.index]
+                    VendorScraper._apply_pricing(result, pricing)
+                    stream.updates.put_nowait((job.index, result))
+            finally:
+                self._queue.task_done()
+
+    def _expire_streams(self) -> None:
+        """Forget streams nobody read within settings.pricing_stream_ttl_seconds."""
+        cutoff = time.monotonic() - settings.pricing_stream_ttl_seconds
+        # Dicts keep insertion order, so the oldest streams come first
+        for search_id, stream in list(self._streams.items()):
+            if stream.created > cutoff:
+                break
+            del self._streams[search_id]
+
+    def has_stream(self, search_id: str) -> bool:
+        return search_id in self._streams
+
+    async def events(self, search_id: str) -> AsyncIterator[str]:
+        """
+        Server-Sent Events for a search: one `pricing` event per finished
+        vendor, then `done`. Stops early if the vendors outrun their timeout.
+        """
+        stream = self._streams.get(search_id)
+        if stream is None:
+            return
+
+        deadline = time.monotonic() + settings.vendor_timeout_seconds + 1
+        try:
+            while stream.pending:
+                remaining = deadline - time.monotonic()
+                try:
+                    index, result = await asyncio.wait_for(stream.updates.get(), timeout=max(remaining, 0))
+                except asyncio.TimeoutError:
+                    break
+
+                stream.pending -= 1
+                payload = {"index": index, "result": result.model_dump()}
+                yield f"event: pricing\ndata: {json.dumps(payload)}\n\n"
+
+            yield f"event: done\ndata: {json.dumps({'search_id': search_id})}\n\n"
+        finally:
+            self._streams.pop(search_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._workers),
+            "streams": len(self._streams),
+        }
+
+
+pricing_jobs = PricingJobQueue()
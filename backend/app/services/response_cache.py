@@ -0,0 +1,115 @@
+import hashlib
+import multiprocessing
+import secrets
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi import Request, Response
+
+from app.config import settings
+from app.responses import dumps
+from app.services.cache import TTLCache
+
+
+def _matches(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def not_modified(etag: str, headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, **headers})
+
+
+class ResponseCache:
+    """
+    Conditional GETs for collections that are read far more than written.
+
+    Each collection has a version counter that the routers bump on every
+    write, and responses carry it in their ETag. A client sending back a
+    current ETag gets a 304 without the database being queried; otherwise
+    the serialized body is kept (per URL and version) so repeat reads skip
+    the query and serialization too.
+
+    The counters are in shared memory: created before gunicorn forks its
+    workers, they're the same counters in every worker, so a write on one
+    invalidates cached pages on all. The ETag also carries a token picked
+    at startup: tags from before a restart never match.
+    """
+
+    COLLECTIONS = ("history", "favorites")
+
+    def __init__(self):
+        self._boot = secrets.token_hex(4)
+        self._slots = {collection: slot for slot, collection in enumerate(self.COLLECTIONS)}
+        self._versions = multiprocessing.Array("q", len(self.COLLECTIONS))
+        self._bodies = TTLCache(settings.response_cache_size, 0)
+        self.not_modified = 0
+
+    def bump(self, collection: str) -> None:
+        """Mark the collection as changed; cached pages and ETags go stale."""
+        with self._versions.get_lock():
+            self._versions[self._slots[collection]] += 1
+
+    def etag(self, collection: str) -> str:
+        # Read without the lock: a single aligned integer can't be seen half-written
+        return f'"{collection}-{self._boot}-{self._versions.get_obj()[self._slots[collection]]}"'
+
+    async def respond(
+        self,
+        request: Request,
+        collection: str,
+        build: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """
+        Response for a GET on `collection`: 304 if the client is up to date,
+        the cached body if this page was served at this version, otherwise
+        whatever `build()` returns, serialized and cached.
+        """
+        # Taken before building: a write landing meanwhile bumps the version,
+        # so a body that may include it is never served under an older tag
+        etag = self.etag(collection)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _matches(request, etag):
+            self.not_modified += 1
+            return not_modified(etag, {"Cache-Control": "no-cache"})
+
+        key = (etag, request.url.path, request.url.query)
+        body = self._bodies.get(key)
+        if body is None:
+            content = await build()
+            body = content.body if isinstance(content, Response) else dumps(content)
+            self._bodies.set(key, body)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "versions": dict(zip(self.COLLECTIONS, self._versions.get_obj())),
+            "not_modified": self.not_modified,
+            "bodies": self._bodies.stats(),
+        }
+
+
+class StaticResponse:
+    """A response that never changes while the process runs, served with a content hash ETag."""
+
+    def __init__(self, content: Any, max_age: int):
+        self.body = dumps(content)
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()[:16]}"'
+        self.headers = {"Cache-Control": f"public, max-age={max_age}"}
+
+    def respond(self, request: Request) -> Response:
+        if _matches(request, self.etag):
+            return not_modified(self.etag, self.headers)
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={"ETag": self.etag, **self.headers}
+        )
+
+
+response_cache = ResponseCache()
@@ -1,6 +1,26 @@
-from typing import List, Dict, Optional
+import asyncio
+import math
+import time
+from typing import List, Dict, NamedTuple, Optional, Set, Tuple
 from urllib.parse import quote_plus
+from app.config import settings
 from app.models.schemas import VendorResult, ParsedQuery
+from app.services.pricing import PRICE_EXTRACTORS, pricing_engine
+from app.services.metrics import observe_vendor
+from app.services.pricing_cache import pricing_cache
+
+
+class VendorTemplate(NamedTuple):
+    """A vendor URL template split around its {query} slot, plus display metadata."""
+    prefix: str
+    suffix: str
+    name: str
+    logo: Optional[str]
+
+
+# Pricing tasks that outlived the search deadline; held so they aren't
+# garbage collected before they finish
+_background_tasks: Set[asyncio.Task] = set()
 
 
 class VendorScraper:
@@ -96,56 +116,163 @@ class VendorScraper:
         },
     }
 
+    # Vendors with a pricing scraper; others only get instant URLs
+    PRICING_VENDORS: Set[str] = set(PRICE_EXTRACTORS) if settings.pricing_enabled else set()
+
+    @classmethod
+    def _compile_templates(cls) -> None:
+        """Pre-split every URL template and freeze its vendor metadata."""
+        compiled = {}
+        for vendor, template in cls.VENDOR_TEMPLATES.items():
+            prefix, slot, suffix = template.partition("{query}")
+            if not slot:
+                raise ValueError(f"Vendor template for {vendor!r} has no {{query}} slot")
+
+            vendor_info = cls.VENDOR_INFO.get(vendor, {"name": vendor.title(), "logo": None})
+            compiled[vendor] = VendorTemplate(prefix, suffix, vendor_info["name"], vendor_info["logo"])
+        cls._COMPILED_TEMPLATES = compiled
+        cls._VENDOR_KEYS = {
+            **{template.name.lower(): vendor for vendor, template in compiled.items()},
+            **{vendor: vendor for vendor in compiled},
+        }
+
+    @classmethod
+    def vendor_key(cls, vendor: str) -> Optional[str]:
+        """Vendor key for a key or display name ("eBay Canada" -> "ebay"); None if unknown."""
+        return cls._VENDOR_KEYS.get(vendor.strip().lower())
+
     @classmethod
     async def search_all_vendors(
         cls,
         query: str,
-        vendors: List[str]
+        vendors: List[str],
+        pricing: bool = True
     ) -> List[VendorResult]:
         """
         Generate search URLs for all requested vendors.
 
-        For Phase 1 (MVP), we generate instant URLs.
-        Future phases will add scraping for pricing.
+        Instant URLs are built up front. Vendors with a pricing scraper are
+        then scraped concurrently (see _fan_out_pricing), so latency is the
+        slowest vendor under the search deadline rather than the sum of all
+        of them. Pass pricing=False to skip scraping entirely.
         """
-        results = []
+        # Encode once; each vendor is then just prefix + query + suffix
+        encoded_query = quote_plus(query)
 
+        results = []
+        to_price = []
         for vendor in vendors:
-            if vendor not in cls.VENDOR_TEMPLATES:
+            template = cls._COMPILED_TEMPLATES.get(vendor)
+            if template is None:
                 continue
 
-            result = await cls._generate_vendor_result(vendor, query)
+            result = cls._build_vendor_result(template, encoded_query)
             results.append(result)
+            if pricing and vendor in cls.PRICING_VENDORS:
+                to_price.append((vendor, result))
+
+        if to_price:
+            await cls._fan_out_pricing(query, to_price)
 
         return results
 
     @classmethod
-    async def _generate_vendor_result(
+    async def _fan_out_pricing(
         cls,
-        vendor: str,
-        query: str
-    ) -> VendorResult:
-        """Generate a vendor result with URL and metadata."""
-        template = cls.VENDOR_TEMPLATES[vendor]
-        encoded_query = quote_plus(query)
-        url = template.format(query=encoded_query)
+        query: str,
+        to_price: List[Tuple[str, VendorResult]],
+        deadline: Optional[float] = None
+    ) -> List[Tuple[VendorResult, asyncio.Task]]:
+        """
+        Scrape pricing for several vendors at once, filling results in place.
+
+        Each vendor gets settings.vendor_timeout_seconds; the whole fan-out
+        waits at most `deadline` (settings.search_deadline_seconds by
+        default). Vendors still running at the deadline are marked
+        "processing" with an eta and keep running in the background; they
+        are returned alongside their tasks so callers can follow up.
+        """
+        if deadline is None:
+            deadline = settings.search_deadline_seconds
+
+        started = time.monotonic()
+        tasks = {
+            asyncio.create_task(cls._scrape_with_timeout(vendor, query)): result
+            for vendor, result in to_price
+        }
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+
+        for task in done:
+            cls._apply_pricing(tasks[task], task.result())
+
+        remaining = settings.vendor_timeout_seconds - (time.monotonic() - started)
+        eta = f"{max(1, math.ceil(remaining))}s"
+        still_running = []
+        for task in pending:
+            result = tasks[task]
+            result.method = "scraping"
+            result.status = "processing"
+            result.eta = eta
+
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            still_running.append((result, task))
 
-        vendor_info = cls.VENDOR_INFO.get(vendor, {"name": vendor.title(), "logo": None})
+        return still_running
 
+    @classmethod
+    async def _scrape_with_timeout(cls, vendor: str, query: str) -> Optional[Dict[str, float]]:
+        """Run scrape_pricing under the per-vendor timeout; failures mean no pricing."""
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(
+                cls.scrape_pricing(vendor, query),
+                timeout=settings.vendor_timeout_seconds
+            )
+        except Exception:
+            return None
+        finally:
+            observe_vendor(vendor, time.perf_counter() - started)
+
+    @staticmethod
+    def _apply_pricing(result: VendorResult, pricing: Optional[Dict[str, float]]) -> None:
+        """Record a finished scrape on its result. The URL stays usable either way."""
+        result.method = "scraping"
+        result.status = "ready"
+        result.pricing = pricing
+        result.eta = None
+
+    @staticmethod
+    def _build_vendor_result(template: VendorTemplate, encoded_query: str) -> VendorResult:
+        """Build a result from a compiled template and an already-encoded query."""
+        # Validated construction: on pydantic 2.5 model_construct is the slower path
         return VendorResult(
-            vendor=vendor_info["name"],
-            url=url,
+            vendor=template.name,
+            url=template.prefix + encoded_query + template.suffix,
             method="instant",
             status="ready",
-            logo_url=vendor_info["logo"]
+            logo_url=template.logo
         )
 
     @classmethod
     async def scrape_pricing(cls, vendor: str, query: str) -> Optional[Dict[str, float]]:
         """
-        Scrape pricing from vendor (Phase 4 feature).
+        Scrape a {"min", "max"} price range from the vendor's search page.
 
-        For now, returns None. Will implement in Phase 4 with Playwright.
+        Served from the pricing cache when possible (stale entries are
+        returned immediately and refreshed in the background).
+        Returns None for vendors without a price extractor.
         """
-        # TODO: Implement in Phase 4
-        return None
+        template = cls._COMPILED_TEMPLATES.get(vendor)
+        if template is None or vendor not in PRICE_EXTRACTORS:
+            return None
+
+        url = template.prefix + quote_plus(query) + template.suffix
+        return await pricing_cache.get_or_fetch(
+            vendor,
+            query,
+            lambda: pricing_engine.fetch_pricing(vendor, url)
+        )
+
+
+VendorScraper._compile_templates()
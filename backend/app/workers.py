@@ -0,0 +1,15 @@
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionWorker(UvicornWorker):
+    """
+    Uvicorn worker for gunicorn (see gunicorn.conf.py) pinned to uvloop and
+    httptools, with the lifespan required so each worker connects its own
+    storage client and starts its own background tasks.
+    """
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+    }
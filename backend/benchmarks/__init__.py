@@ -0,0 +1,15 @@
+"""
+Benchmarks for the backend hot paths.
+
+Run modules from the backend directory, e.g.
+    python -m benchmarks.bench_query_parser
+
+bench_hot_paths (per-call latency of parsing and URL generation),
+load_test (the API under concurrent clients) and scale_workers (gunicorn
+throughput by worker count) take --output to write JSON results; compare
+two runs with
+    python -m benchmarks.compare before.json after.json
+
+replay_pricing checks the vendor price extractors against the saved search
+pages in fixtures/pricing.
+"""
@@ -0,0 +1,80 @@
+"""
+Show fuzzy lookup cost staying flat as the vocabulary grows.
+
+The real brand list is padded with synthetic brand-like words up to each
+vocabulary size, and the same misspelled queries are looked up in the
+FuzzyIndex (symmetric deletion: candidates come from dict lookups of the
+query's deletion variants) and with a linear scan (edit distance to every
+term).
+
+Run from the backend directory:
+    python -m benchmarks.bench_fuzzy_matcher
+"""
+import random
+import string
+import timeit
+from typing import List
+
+from app.services.fuzzy import FuzzyIndex, default_max_distance, edit_distance
+from app.services.parser import QueryParser
+
+SIZES = [100, 1_000, 5_000, 20_000]
+
+# Misspellings the alias list doesn't cover, plus words that match nothing
+QUERIES = [
+    "milwauke", "dewlat", "festoll", "makitaa", "hitachy", "ridgd",
+    "bostich", "paslod", "campbel hausfeld", "porter cabel", "metabbo",
+    "anvil", "exhaust", "deflector", "trigger", "sawtooth",
+]
+
+
+def build_vocabulary(size: int, seed: int = 1234) -> List[str]:
+    """Real brand aliases padded with random pronounceable words."""
+    rng = random.Random(seed)
+    vocabulary = list(QueryParser.BRANDS)
+    consonants = "bcdfghjklmnprstvwz"
+    vowels = "aeiou"
+    while len(vocabulary) < size:
+        syllables = rng.randint(2, 4)
+        word = "".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(syllables))
+        if rng.random() < 0.3:
+            word += rng.choice(string.ascii_lowercase)
+        vocabulary.append(word)
+    return vocabulary
+
+
+def linear_best(vocabulary: List[str], word: str):
+    """Baseline: edit distance against every term."""
+    budget = default_max_distance(word)
+    best = None
+    for term in vocabulary:
+        distance = edit_distance(word, term, budget)
+        if distance <= budget and (best is None or distance < best[1]):
+            best = (term, distance)
+    return best
+
+
+def main(repeat: int = 5) -> None:
+    print(f"{'terms':>7}  {'index µs/query':>15}  {'linear µs/query':>16}")
+    for size in SIZES:
+        vocabulary = build_vocabulary(size)
+        index = FuzzyIndex(vocabulary, memo_size=0)  # Time lookups, not the memo
+
+        # Same answers as the exhaustive scan
+        for word in QUERIES:
+            expected = linear_best(index.terms, word)
+            found = index.best(word)
+            assert (found and found[1]) == (expected and expected[1]), (word, found, expected)
+
+        indexed = min(timeit.repeat(
+            lambda: [index.best(word) for word in QUERIES], number=20, repeat=repeat
+        )) / (20 * len(QUERIES))
+        linear = min(timeit.repeat(
+            lambda: [linear_best(index.terms, word) for word in QUERIES], number=1, repeat=repeat
+        )) / len(QUERIES)
+
+        print(f"{size:>7}  {indexed * 1e6:>15.1f}  {linear * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Per-call latency of the search hot paths over the query corpus.
+
+Times QueryParser.parse, build_search_query and search_all_vendors one
+call at a time, so p50/p99 come from real distributions rather than an
+average. The parser caches are measured disabled over the whole corpus
+(every call does the work) and as configured over a repeating mix of
+corpus queries that fits in them, with the hit rate in the row name. A
+corpus larger than the cache walked in order would only measure misses.
+Vendor pricing is off: only URL generation is timed, no network.
+
+Run from the backend directory:
+    python -m benchmarks.bench_hot_paths [--output results/hot_paths.json]
+"""
+import argparse
+import asyncio
+import time
+from typing import Callable, Dict, List
+
+from app.models.schemas import DEFAULT_VENDORS
+from app.services.cache import TTLCache
+from app.services.parser import QueryParser
+from app.services.scraper import VendorScraper
+from benchmarks.corpus import build_corpus
+from benchmarks.results import print_table, summarize, write_results
+
+
+def time_calls(function: Callable, arguments: List, rounds: int) -> Dict[str, float]:
+    """Call function(argument) for every argument, `rounds` times, timing each call."""
+    clock = time.perf_counter
+    samples = []
+    started = clock()
+    for _ in range(rounds):
+        for argument in arguments:
+            before = clock()
+            function(argument)
+            samples.append(clock() - before)
+    return summarize(samples, clock() - started)
+
+
+async def time_async_calls(function: Callable, arguments: List, rounds: int) -> Dict[str, float]:
+    clock = time.perf_counter
+    samples = []
+    started = clock()
+    for _ in range(rounds):
+        for argument in arguments:
+            before = clock()
+            await function(argument)
+            samples.append(clock() - before)
+    return summarize(samples, clock() - started)
+
+
+def uncached(function: Callable) -> Callable:
+    """Run function with the parser caches disabled."""
+    def run(*args):
+        caches = (QueryParser._parse_cache, QueryParser._search_query_cache)
+        sizes = [cache.max_size for cache in caches]
+        for cache in caches:
+            cache.clear()
+            cache.max_size = 0
+        try:
+            return function(*args)
+        finally:
+            for cache, size in zip(caches, sizes):
+                cache.max_size = size
+    return run
+
+
+def repeating_mix(items: List, count: int, distinct: int) -> List:
+    """`count` items cycling through the first `distinct` distinct ones."""
+    working_set = list(dict.fromkeys(items))[:max(distinct, 1)]
+    return [working_set[i % len(working_set)] for i in range(count)]
+
+
+def time_cached(cache: TTLCache, function: Callable, arguments: List, rounds: int) -> tuple[str, Dict[str, float]]:
+    """time_calls from a cold cache; returns a row label suffix with the hit rate and the stats."""
+    cache.clear()
+    hits, misses = cache.hits, cache.misses
+    stats = time_calls(function, arguments, rounds)
+    hits, misses = cache.hits - hits, cache.misses - misses
+    stats["hit_rate"] = round(hits / (hits + misses), 4) if hits + misses else 0.0
+    return f"cached, {stats['hit_rate']:.0%} hits", stats
+
+
+def run_benchmarks(size: int, rounds: int) -> Dict[str, Dict[str, float]]:
+    queries = build_corpus(size)
+    parsed = [QueryParser.parse(query) for query in queries]
+    search_queries = [QueryParser.build_search_query(item) for item in parsed]
+
+    # Half as many distinct queries as the cache holds, so the mix stays resident
+    hot_queries = repeating_mix(queries, len(queries), QueryParser._parse_cache.max_size // 2)
+    hot_parsed = [QueryParser.parse(query) for query in hot_queries]
+
+    results = {}
+    results["parse (uncached)"] = uncached(time_calls)(QueryParser.parse, queries, rounds)
+    label, stats = time_cached(QueryParser._parse_cache, QueryParser.parse, hot_queries, rounds)
+    results[f"parse ({label})"] = stats
+    results["build_search_query (uncached)"] = uncached(time_calls)(QueryParser.build_search_query, parsed, rounds)
+    label, stats = time_cached(QueryParser._search_query_cache, QueryParser.build_search_query, hot_parsed, rounds)
+    results[f"build_search_query ({label})"] = stats
+
+    async def search(query: str):
+        return await VendorScraper.search_all_vendors(query, DEFAULT_VENDORS, pricing=False)
+
+    results["search_all_vendors"] = asyncio.run(time_async_calls(search, search_queries, rounds))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=5_000, help="Corpus queries")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the corpus")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.size, args.rounds)
+    print(f"{args.size} corpus queries x {args.rounds} rounds, {len(DEFAULT_VENDORS)} vendors\n")
+    print_table(results, unit="calls/s")
+    write_results(args.output, "hot_paths", {"size": args.size, "rounds": args.rounds}, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Golden check and timing for the fused model-number extractor.
+
+Replays the corpus (plus hand-picked edge cases) through the original
+four-pattern cascade and the fused single-scan extractor, fails loudly on
+any mismatch, then reports per-query cost.
+
+Run from the backend directory:
+    python -m benchmarks.bench_model_extractor
+"""
+import re
+import timeit
+from typing import Optional
+
+from app.services.parser import QueryParser
+from benchmarks.corpus import build_corpus
+
+# Queries where pattern order and position disagree
+EDGE_CASES = [
+    "2135 cb-440 trigger",
+    "894a dtd152",
+    "n123456 2135",
+    "ir-2135timax",
+    "cb440 cb-440",
+    "abcde-12 999",
+    "dtd-152a 12",
+    "12 34 5678",
+    "",
+]
+
+
+def legacy_extract_model(query: str) -> Optional[str]:
+    """The original ordered cascade, patterns rebuilt on every call."""
+    patterns = [
+        r'\b([A-Z]{2,4}-\d{2,5}[A-Z]?)\b',
+        r'\b([A-Z]{2,4}\d{3,5}[A-Z]?)\b',
+        r'\b([A-Z]{2}\d{4,6})\b',
+        r'\b(\d{3,5}[A-Z]?)\b',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, query.upper())
+        if match:
+            return match.group(1)
+    return None
+
+
+def main(size: int = 10_000, repeat: int = 5) -> None:
+    corpus = [q.lower().strip() for q in build_corpus(size)] + EDGE_CASES
+
+    mismatches = [
+        (query, legacy_extract_model(query), QueryParser._extract_model(query))
+        for query in corpus
+        if legacy_extract_model(query) != QueryParser._extract_model(query)
+    ]
+    if mismatches:
+        for query, expected, actual in mismatches[:20]:
+            print(f"MISMATCH {query!r}: expected {expected!r}, got {actual!r}")
+        raise SystemExit(f"{len(mismatches)} mismatches against the legacy cascade")
+
+    def run_legacy():
+        for query in corpus:
+            legacy_extract_model(query)
+
+    def run_fused():
+        for query in corpus:
+            QueryParser._extract_model(query)
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=repeat))
+    fused = min(timeit.repeat(run_fused, number=1, repeat=repeat))
+
+    print(f"queries:  {len(corpus)} (all match the legacy cascade)")
+    print(f"legacy:   {legacy * 1e6 / len(corpus):.2f} µs/query")
+    print(f"fused:    {fused * 1e6 / len(corpus):.2f} µs/query")
+    print(f"speed-up: {legacy / fused:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
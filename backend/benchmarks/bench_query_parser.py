@@ -0,0 +1,136 @@
+"""
+Golden check for the single-pass tokenizer, and timing against the
+original extraction pipeline.
+
+The original ran a substring test per brand alias, the four model patterns
+one after another, and then one str.replace per brand, model and tool type
+to whittle the query down to the part. The tokenizer scans the query once
+and classifies tokens with dict lookups. It differs from the original on
+purpose (word boundaries, fuzzy matches), so it's checked against
+hand-written expectations rather than the legacy output.
+
+Run from the backend directory:
+    python -m benchmarks.bench_query_parser
+"""
+import re
+import timeit
+from typing import Optional
+
+from app.services.parser import QueryParser
+from benchmarks.bench_model_extractor import legacy_extract_model
+from benchmarks.corpus import build_corpus
+
+# (query, (brand, model, part)) the tokenizer must reproduce
+GOLDEN = [
+    ("makita dtd152 carbon brush", ("Makita", "DTD152", "carbon brush")),
+    ("dewalt dcf887 impact driver anvil", ("Dewalt", "DCF887", "anvil")),
+    ("milwaukee 2767-20 o-ring", ("Milwaukee", "2767", "o-ring")),
+    ("sawtooth blade guard", (None, None, "sawtooth blade guard")),
+    ("jigsaw blade", (None, None, "blade")),
+    ("impcat wrench anvil", (None, None, "anvil")),
+    ("angle grindr switch", (None, None, "switch")),
+    ("makita drills chuck", ("Makita", None, "chuck")),
+    # Words one edit from a tool type that are part names of their own
+    ("cp 734 drive shaft", ("Chicago Pneumatic", "734", "drive shaft")),
+    ("drive gear", (None, None, "drive gear")),
+    ("driven gear", (None, None, "driven gear")),
+    ("ir 231 1/2 drive anvil", ("Ingersoll Rand", "231", "1/2 drive anvil")),
+    ("senco staples", ("Senco", None, "staples")),
+    ("compressed air fitting", (None, None, "compressed air fitting")),
+    # Words one edit from a short brand alias are only brands next to a model or part
+    ("boss", (None, None, "boss")),
+    ("the boss hammer", (None, None, "the boss hammer")),
+    ("bsoch brush", ("Bosch", None, "brush")),
+    ("senci 2135", ("Senco", "2135", None)),
+    ("milwauke trigger", ("Milwaukee", None, "trigger")),
+]
+
+
+def legacy_extract_brand(query: str) -> tuple[Optional[str], Optional[str]]:
+    """The original implementation: substring test per alias."""
+    for brand in QueryParser.BRANDS:
+        if brand in query:
+            normalized = None
+            if brand in ["ingersoll rand", "ir", "ingersol", "ingersoll"]:
+                normalized = "Ingersoll Rand"
+            elif brand in ["chicago pneumatic", "cp"]:
+                normalized = "Chicago Pneumatic"
+            elif brand in ["snap-on", "snap on", "snapon"]:
+                normalized = "Snap-on"
+            elif brand in ["mac tools", "mac"]:
+                normalized = "Mac Tools"
+            elif brand in ["dewalt", "de walt", "dwalt"]:
+                normalized = "Dewalt"
+            elif brand in ["makita", "makitta", "maketa"]:
+                normalized = "Makita"
+            elif brand in ["milwaukee", "milwakee", "milwaukie"]:
+                normalized = "Milwaukee"
+            elif brand in ["bosch", "bosh"]:
+                normalized = "Bosch"
+            elif brand in ["porter cable", "porter-cable"]:
+                normalized = "Porter Cable"
+            elif brand in ["campbell hausfeld"]:
+                normalized = "Campbell Hausfeld"
+            elif brand in ["hitachi", "hikoki"]:
+                normalized = "Hitachi"
+            elif brand in ["ridgid", "rigid"]:
+                normalized = "Ridgid"
+            elif brand in ["black+decker", "black and decker", "b+d"]:
+                normalized = "Black+Decker"
+            else:
+                normalized = brand.title()
+            return (normalized, brand)
+    return (None, None)
+
+
+def legacy_extract_part(query: str, brand: Optional[str], model: Optional[str]) -> Optional[str]:
+    """The original implementation: one str.replace per brand, model and tool type."""
+    remaining = query
+    if brand:
+        remaining = remaining.replace(brand.lower(), "").strip()
+    if model:
+        remaining = remaining.replace(model.lower(), "").strip()
+    for tool_type in QueryParser.TOOL_TYPES:
+        remaining = remaining.replace(tool_type, "").strip()
+    remaining = re.sub(r'\s+', ' ', remaining).strip()
+    return remaining if remaining else None
+
+
+def legacy_parse(query: str):
+    brand, brand_matched = legacy_extract_brand(query)
+    model = legacy_extract_model(query)
+    return brand, model, legacy_extract_part(query, brand_matched, model)
+
+
+def main(size: int = 10_000, repeat: int = 5) -> None:
+    mismatches = [
+        (query, expected, QueryParser._classify(query))
+        for query, expected in GOLDEN
+        if QueryParser._classify(query) != expected
+    ]
+    if mismatches:
+        for query, expected, actual in mismatches:
+            print(f"MISMATCH {query!r}: expected {expected!r}, got {actual!r}")
+        raise SystemExit(f"{len(mismatches)} golden queries parsed differently")
+
+    corpus = [q.lower().strip() for q in build_corpus(size)]
+
+    def run_legacy():
+        for query in corpus:
+            legacy_parse(query)
+
+    def run_tokenized():
+        for query in corpus:
+            QueryParser._classify(query)
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=repeat))
+    tokenized = min(timeit.repeat(run_tokenized, number=1, repeat=repeat))
+
+    print(f"queries:   {len(corpus)} (plus {len(GOLDEN)} golden, all as expected)")
+    print(f"legacy:    {legacy * 1e6 / len(corpus):.2f} µs/query")
+    print(f"tokenized: {tokenized * 1e6 / len(corpus):.2f} µs/query")
+    print(f"speed-up:  {legacy / tokenized:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
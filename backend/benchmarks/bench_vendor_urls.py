@@ -0,0 +1,70 @@
+"""
+Compare precompiled vendor templates against per-call str.format.
+
+Run from the backend directory:
+    python -m benchmarks.bench_vendor_urls
+"""
+import asyncio
+import timeit
+from typing import List
+from urllib.parse import quote_plus
+
+from app.models.schemas import DEFAULT_VENDORS, VendorResult
+from app.services.parser import QueryParser
+from app.services.scraper import VendorScraper
+from benchmarks.corpus import build_corpus
+
+
+def legacy_search_all_vendors(query: str, vendors: List[str]) -> List[VendorResult]:
+    """The original per-vendor format + lookup + validated model."""
+    results = []
+    for vendor in vendors:
+        if vendor not in VendorScraper.VENDOR_TEMPLATES:
+            continue
+        template = VendorScraper.VENDOR_TEMPLATES[vendor]
+        url = template.format(query=quote_plus(query))
+        vendor_info = VendorScraper.VENDOR_INFO.get(vendor, {"name": vendor.title(), "logo": None})
+        results.append(VendorResult(
+            vendor=vendor_info["name"],
+            url=url,
+            method="instant",
+            status="ready",
+            logo_url=vendor_info["logo"]
+        ))
+    return results
+
+
+def main(size: int = 2_000, repeat: int = 5) -> None:
+    queries = [QueryParser.build_search_query(QueryParser.parse(q)) for q in build_corpus(size)]
+    loop = asyncio.new_event_loop()
+
+    for query in queries[:200]:
+        expected = [r.model_dump() for r in legacy_search_all_vendors(query, DEFAULT_VENDORS)]
+        actual = [r.model_dump() for r in loop.run_until_complete(
+            VendorScraper.search_all_vendors(query, DEFAULT_VENDORS)
+        )]
+        assert expected == actual, query
+
+    def run_legacy():
+        for query in queries:
+            legacy_search_all_vendors(query, DEFAULT_VENDORS)
+
+    async def compiled_batch():
+        for query in queries:
+            await VendorScraper.search_all_vendors(query, DEFAULT_VENDORS)
+
+    def run_compiled():
+        loop.run_until_complete(compiled_batch())
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=repeat))
+    compiled = min(timeit.repeat(run_compiled, number=1, repeat=repeat))
+    loop.close()
+
+    print(f"searches: {len(queries)} x {len(DEFAULT_VENDORS)} vendors")
+    print(f"legacy:   {legacy * 1e6 / len(queries):.2f} µs/search")
+    print(f"compiled: {compiled * 1e6 / len(queries):.2f} µs/search")
+    print(f"speed-up: {legacy / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
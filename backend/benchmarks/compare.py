@@ -0,0 +1,50 @@
+"""
+Compare two benchmark result files (from --output) metric by metric.
+
+Run from the backend directory:
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+
+METRICS = ("p50_us", "p99_us", "per_second", "cpu_us")
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return ""
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+
+    if before["suite"] != after["suite"]:
+        parser.error(f"Different suites: {before['suite']} vs {after['suite']}")
+    if before["config"] != after["config"]:
+        print(f"⚠️ Configs differ: {before['config']} vs {after['config']}\n")
+
+    print(f"{before['suite']}: {before['commit']} -> {after['commit']}\n")
+    for name, new in after["results"].items():
+        old = before["results"].get(name)
+        if old is None:
+            print(f"{name}: new")
+            continue
+        print(name)
+        for metric in METRICS:
+            if metric not in old or metric not in new:
+                continue
+            print(f"    {metric:<12}{old[metric]:>12}{new[metric]:>12}  {change(old[metric], new[metric])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Deterministic query corpus for benchmarks.
+
+Mirrors what technicians type into the search bar: brand (sometimes
+misspelled), model number, tool type and part, in varying combinations.
+"""
+import random
+from typing import List
+
+BRANDS = [
+    "makita", "makitta", "milwaukee", "milwakee", "dewalt", "dwalt",
+    "ingersoll rand", "ir", "chicago pneumatic", "cp", "snap-on", "snap on",
+    "mac tools", "bosch", "bosh", "porter cable", "hitachi", "hikoki",
+    "ridgid", "ryobi", "black+decker", "metabo", "festool", "hilti",
+]
+
+MODELS = [
+    "dtd152", "dtd-152", "cb-440", "cb440", "2135", "2135timax", "894a",
+    "dwe402", "n123456", "7748", "ir-231", "cp7748", "2767-20", "gws18v",
+    "xdt13z", "12345", "dcf887", "ga4530", "ls1019l", "hr2475",
+]
+
+TOOL_TYPES = [
+    "impact wrench", "impact driver", "angle grinder", "die grinder",
+    "air ratchet", "drill", "hammer drill", "circular saw", "jigsaw",
+    "orbital sander", "nailer", "air compressor", "rotary hammer",
+]
+
+PARTS = [
+    "carbon brush", "brush", "trigger switch", "switch", "chuck",
+    "ball bearing", "bearing", "gear set", "armature", "rotor vane",
+    "vane", "o-ring", "seal kit", "gasket", "return spring", "check valve",
+    "piston", "anvil", "hammer cage", "motor", "exhaust deflector",
+    "rebuild kit", "sawtooth blade guard",
+]
+
+
+def build_corpus(size: int = 10_000, seed: int = 1234) -> List[str]:
+    """Build a reproducible list of realistic search queries."""
+    rng = random.Random(seed)
+    queries = []
+
+    for _ in range(size):
+        pieces = []
+        if rng.random() < 0.8:
+            pieces.append(rng.choice(BRANDS))
+        if rng.random() < 0.7:
+            pieces.append(rng.choice(MODELS))
+        if rng.random() < 0.4:
+            pieces.append(rng.choice(TOOL_TYPES))
+        if rng.random() < 0.9 or not pieces:
+            pieces.append(rng.choice(PARTS))
+
+        query = " ".join(pieces)
+        if rng.random() < 0.3:
+            query = query.upper() if rng.random() < 0.5 else query.title()
+        queries.append(query)
+
+    return queries
@@ -0,0 +1,127 @@
+"""
+In-process load test of the API at fixed concurrency.
+
+Runs the real app (middleware, lifespan, background writers) behind
+httpx's ASGI transport, on the SQLite backend in memory, so no server,
+network or Mongo is involved and runs are comparable between commits.
+Each endpoint is driven by `--concurrency` clients sending requests back
+to back until `--requests` have completed:
+
+    POST /api/search     corpus queries (vendor pricing off)
+    GET  /api/history    after the searches above filled it
+    GET  /api/favorites  seeded with --favorites entries
+
+The GETs run twice: with the response cache off, so every request
+queries and serializes, then with it on (nothing is written meanwhile,
+so all but the first are served from it, the frontend's polling path).
+cpu_us is process CPU time per request, client side included.
+
+Run from the backend directory:
+    python -m benchmarks.load_test [--concurrency 16] [--output results/load.json]
+"""
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from app.config import settings
+from app.main import app
+from app.services.response_cache import response_cache
+from app.services.scraper import VendorScraper
+from benchmarks.corpus import build_corpus
+from benchmarks.results import print_table, summarize, write_results
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    make_request: Callable[[int], Any],
+    total: int,
+    concurrency: int
+) -> Dict[str, float]:
+    """Send `total` requests from `concurrency` clients; latency per request."""
+    counter = itertools.count()
+    samples: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        clock = time.perf_counter
+        while (number := next(counter)) < total:
+            before = clock()
+            response = await make_request(number)
+            samples.append(clock() - before)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    stats = summarize(samples, time.perf_counter() - started)
+    stats["cpu_us"] = round((time.process_time() - cpu_started) / max(len(samples), 1) * 1e6, 2)
+    stats["errors"] = errors
+    return stats
+
+
+async def run_load_test(requests: int, concurrency: int, favorites: int) -> Dict[str, Dict[str, float]]:
+    queries = build_corpus(requests)
+    results = {}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for number in range(favorites):
+                await client.post("/api/favorites", json={
+                    "part_description": f"Part {number}",
+                    "search_query": queries[number % len(queries)] + f" #{number}",
+                })
+
+            results["POST /api/search"] = await drive(
+                client,
+                lambda number: client.post("/api/search", json={"query": queries[number]}),
+                requests, concurrency
+            )
+            for cached in (False, True):
+                response_cache._bodies.max_size = settings.response_cache_size if cached else 0
+                suffix = " (cached)" if cached else ""
+                results["GET /api/history" + suffix] = await drive(
+                    client,
+                    lambda number: client.get("/api/history", params={"limit": settings.search_history_limit}),
+                    requests, concurrency
+                )
+                results["GET /api/favorites" + suffix] = await drive(
+                    client,
+                    lambda number: client.get("/api/favorites", params={"limit": 100}),
+                    requests, concurrency
+                )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2_000, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--favorites", type=int, default=200, help="Favorites seeded before the run")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    # A fresh in-memory database per run; no pricing scrapes over the network
+    settings.storage_backend = "sqlite"
+    settings.sqlite_path = ":memory:"
+    VendorScraper.PRICING_VENDORS.clear()
+
+    results = asyncio.run(run_load_test(args.requests, args.concurrency, args.favorites))
+    print(f"\n{args.requests} requests per endpoint, {args.concurrency} concurrent clients\n")
+    print_table(results, unit="req/s")
+    write_results(
+        args.output, "load_test",
+        {"requests": args.requests, "concurrency": args.concurrency, "favorites": args.favorites},
+        results
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Replay saved vendor search pages through the pricing extractors.
+
+Each vendor in PRICE_EXTRACTORS has a search page in fixtures/pricing,
+hand-trimmed to a few listings that carry the markup the extractor has to
+get right (price ranges, struck-out list and regular prices, thousands
+separators). A local server serves each page and the real PricingEngine
+fetches it through host_overrides, so the URL templates, the HTTP client
+and the extractors are all exercised; the min and max it extracts must
+match EXPECTED.
+
+When a vendor changes its markup, save a fresh search page over its
+fixture, trim it to a handful of listings, and update EXPECTED by hand
+from the prices on the page.
+
+Run from the backend directory:
+    python -m benchmarks.replay_pricing
+"""
+import asyncio
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator
+from urllib.parse import quote_plus
+
+import httpx
+
+from app.services.pricing import PRICE_EXTRACTORS, PricingEngine
+from app.services.scraper import VendorScraper
+
+FIXTURES = Path(__file__).parent / "fixtures" / "pricing"
+
+QUERY = "makita carbon brush"
+
+# Price range each fixture page must produce
+EXPECTED: Dict[str, Dict[str, float]] = {
+    # The top of a "to" range is the highest price; shipping costs aren't prices
+    "ebay": {"min": 9.99, "max": 39.99},
+    # The struck-out $29.99 list price is ignored
+    "amazon": {"min": 11.99, "max": 22.50},
+    # Regular (oldPrice) amounts of items on special are ignored
+    "kms_tools": {"min": 8.49, "max": 45.00},
+    # The <del> old price of a sale item is ignored; a variable product's range counts
+    "contractor_cave": {"min": 6.50, "max": 74.95},
+    # Thousands separators
+    "canada_tool_parts": {"min": 3.25, "max": 1150.00},
+}
+
+
+def fixture_handler(page: bytes):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+@contextmanager
+def fixture_servers() -> Iterator[Dict[str, str]]:
+    """One local server per vendor serving its fixture for any path; yields host -> origin."""
+    servers = []
+    overrides = {}
+    try:
+        for vendor in EXPECTED:
+            page = (FIXTURES / f"{vendor}.html").read_bytes()
+            server = ThreadingHTTPServer(("127.0.0.1", 0), fixture_handler(page))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers.append(server)
+
+            host = httpx.URL(VendorScraper._COMPILED_TEMPLATES[vendor].prefix).host
+            overrides[host] = f"http://127.0.0.1:{server.server_address[1]}"
+        yield overrides
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+async def replay(overrides: Dict[str, str]) -> Dict[str, object]:
+    engine = PricingEngine(host_overrides=overrides)
+    try:
+        extracted = {}
+        for vendor in EXPECTED:
+            template = VendorScraper._COMPILED_TEMPLATES[vendor]
+            url = template.prefix + quote_plus(QUERY) + template.suffix
+            extracted[vendor] = await engine.fetch_pricing(vendor, url)
+        return extracted
+    finally:
+        await engine.close()
+
+
+def main() -> None:
+    missing = sorted(set(PRICE_EXTRACTORS) - set(EXPECTED))
+    if missing:
+        raise SystemExit(f"No fixture page for: {', '.join(missing)}")
+
+    with fixture_servers() as overrides:
+        extracted = asyncio.run(replay(overrides))
+
+    mismatches = [(vendor, EXPECTED[vendor], extracted[vendor]) for vendor in EXPECTED
+                  if extracted[vendor] != EXPECTED[vendor]]
+    if mismatches:
+        for vendor, expected, actual in mismatches:
+            print(f"MISMATCH {vendor}: expected {expected!r}, got {actual!r}")
+        raise SystemExit(f"{len(mismatches)} vendor pages priced differently")
+
+    for vendor, pricing in extracted.items():
+        print(f"{vendor:<20}min {pricing['min']:>8.2f}   max {pricing['max']:>8.2f}")
+    print(f"\n{len(extracted)} vendor pages, all as expected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Summary statistics and JSON output shared by the benchmark suite.
+
+Every result file records the commit it was measured at, so two runs can
+be put side by side with benchmarks.compare.
+"""
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Latency percentiles (in microseconds) and throughput for per-operation
+    samples in seconds, taken over `elapsed` wall-clock seconds.
+    """
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50_us": round(percentile(ordered, 0.50) * 1e6, 2),
+        "p99_us": round(percentile(ordered, 0.99) * 1e6, 2),
+        "max_us": round(ordered[-1] * 1e6, 2) if ordered else 0.0,
+        "per_second": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def write_results(path: Optional[str], suite: str, config: Dict[str, Any], results: Dict[str, Any]) -> None:
+    """Write results to `path` as JSON (nothing is written without a path)."""
+    if not path:
+        return
+
+    document = {
+        "suite": suite,
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(document, indent=2) + "\n")
+    print(f"\nResults written to {path}")
+
+
+def print_table(results: Dict[str, Dict[str, float]], unit: str = "ops/s") -> None:
+    with_cpu = any("cpu_us" in stats for stats in results.values())
+    print(f"{'':<40}{'p50 µs':>10}{'p99 µs':>10}{'max µs':>11}{unit:>12}" + (f"{'cpu µs':>10}" if with_cpu else ""))
+    for name, stats in results.items():
+        print(
+            f"{name:<40}{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}"
+            f"{stats['max_us']:>11.1f}{stats['per_second']:>12.1f}"
+            + (f"{stats.get('cpu_us', 0):>10.1f}" if with_cpu else "")
+        )
@@ -0,0 +1,186 @@
+"""
+Throughput of the production server (gunicorn.conf.py) as workers are added.
+
+For each worker count, starts gunicorn on a fresh SQLite file (vendor
+pricing off), then drives POST /api/search with corpus queries from
+`--clients` load-generator processes of `--concurrency` connections each,
+for `--seconds`. Reports requests per second, latency, and the speed-up
+over one worker with its efficiency (speed-up / workers; 1.0 is linear).
+
+The load generators run on the same machine, so give the server the cores
+being measured and the clients the rest, e.g. on an 8-core box:
+    taskset -c 0-3 python -m benchmarks.scale_workers --workers 1,2,4 --client-cpus 4-7
+
+Run from the backend directory:
+    python -m benchmarks.scale_workers [--workers 1,2,4] [--output results/scale.json]
+"""
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.corpus import build_corpus
+from benchmarks.results import print_table, summarize, write_results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, database: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "WORKERS": str(workers),
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "STORAGE_BACKEND": "sqlite",
+        "SQLITE_PATH": database,
+        "PRICING_ENABLED": "false",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def wait_until_ready(url: str, server: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"gunicorn exited with status {server.returncode}")
+        try:
+            if httpx.get(url + "/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"gunicorn not ready after {timeout:.0f}s")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+async def generate_load(url: str, concurrency: int, seconds: float, offset: int) -> List[float]:
+    """Back-to-back searches from `concurrency` connections; latency per request."""
+    queries = build_corpus(2_000, seed=offset)
+    counter = itertools.count()
+    samples: List[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def connection(client: httpx.AsyncClient):
+        clock = time.perf_counter
+        while clock() < deadline:
+            query = queries[next(counter) % len(queries)]
+            before = clock()
+            response = await client.post("/api/search", json={"query": query})
+            if response.status_code == 200:
+                samples.append(clock() - before)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        await asyncio.gather(*(connection(client) for _ in range(concurrency)))
+    return samples
+
+
+def client_process(url: str, concurrency: int, seconds: float, offset: int, cpus: Optional[str]) -> List[float]:
+    if cpus:
+        os.sched_setaffinity(0, parse_cpus(cpus))
+    return asyncio.run(generate_load(url, concurrency, seconds, offset))
+
+
+def parse_cpus(spec: str) -> set:
+    """CPU list as taskset takes it ("4-7", "4,5,6") to a set of CPU numbers."""
+    cpus = set()
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def measure(workers: int, clients: int, concurrency: int, seconds: float, client_cpus: Optional[str]) -> Dict[str, float]:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as directory:
+        server = start_server(workers, port, os.path.join(directory, "scale.db"))
+        try:
+            wait_until_ready(url, server)
+            # Warm up (parser caches, keep-alive connections) before measuring
+            client_process(url, concurrency, min(seconds, 2.0), 0, client_cpus)
+
+            started = time.perf_counter()
+            with multiprocessing.Pool(clients) as pool:
+                runs = pool.starmap(
+                    client_process,
+                    [(url, concurrency, seconds, offset + 1, client_cpus) for offset in range(clients)]
+                )
+            elapsed = time.perf_counter() - started
+        finally:
+            stop_server(server)
+
+    return summarize([sample for run in runs for sample in run], elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=4, help="Load-generator processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Connections per load generator")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measured run per worker count")
+    parser.add_argument("--client-cpus", help="Pin load generators to these CPUs, e.g. 4-7")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    counts = [int(count) for count in args.workers.split(",")]
+    results = {}
+    for workers in counts:
+        print(f"Measuring {workers} worker(s)...", flush=True)
+        results[f"workers={workers}"] = measure(
+            workers, args.clients, args.concurrency, args.seconds, args.client_cpus
+        )
+
+    # Relative to the first worker count, scaled to per worker
+    first = results[f"workers={counts[0]}"]["per_second"]
+    for workers in counts:
+        stats = results[f"workers={workers}"]
+        stats["speed_up"] = round(stats["per_second"] / first, 2) if first else 0.0
+        stats["efficiency"] = round(stats["speed_up"] * counts[0] / workers, 2)
+
+    print(f"\nPOST /api/search, {args.clients} x {args.concurrency} connections, {args.seconds:.0f}s per run, "
+          f"{len(os.sched_getaffinity(0))} CPUs available\n")
+    print_table(results, unit="req/s")
+    print()
+    for name, stats in results.items():
+        print(f"{name:<32}speed-up {stats['speed_up']:.2f}x   efficiency {stats['efficiency']:.2f}")
+
+    write_results(
+        args.output, "scale_workers",
+        {
+            "workers": counts,
+            "clients": args.clients,
+            "concurrency": args.concurrency,
+            "seconds": args.seconds,
+            "cpus": len(os.sched_getaffinity(0)),
+        },
+        results
+    )
+
+
+if __name__ == "__main__":
+    main()
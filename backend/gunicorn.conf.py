@@ -0,0 +1,54 @@
+"""
+Production server: gunicorn managing uvicorn workers (uvloop + httptools).
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Worker count comes from WORKERS (0 = one per CPU core) and the port from
+PORT. Per-process state follows one rule: whatever is read-only is built
+once here and shared, everything else is per worker.
+
+- Built before fork, shared copy-on-write: the app is preloaded in the
+  master, so the parser's phrase tables and fuzzy indexes, the compiled
+  vendor templates and the /api/vendors body exist once. gc.freeze() moves
+  them out of the collector's reach, so workers running a collection
+  don't write to (and so copy) those pages.
+- Shared memory: the history/favorites version counters behind ETags
+  (app.services.response_cache) live in a shared array created before
+  fork, so a write on any worker invalidates every worker's cached pages.
+  The request metrics (app.services.metrics) do too, so /metrics reports
+  every worker's requests whichever worker answers the scrape.
+- Per worker, via the app lifespan: the storage client, the history
+  writer, pricing jobs and HTTP pool, and the catalog index, equivalents
+  graph and order ranking loaded from storage. Workers reload those three
+  every INDEX_RELOAD_SECONDS to pick up each other's writes.
+- Per worker, shared-nothing: parser, pricing and response caches warm
+  independently.
+
+Streamed pricing (`stream: true`) needs its SSE request to reach the
+worker that holds the job, so with several workers streamed searches are
+priced inline instead (see search_parts).
+"""
+import gc
+import multiprocessing
+import os
+
+from app import config as app_config
+from app.config import settings
+
+bind = f"{settings.host}:{os.environ.get('PORT', settings.port)}"
+workers = settings.workers if settings.workers > 0 else multiprocessing.cpu_count()
+app_config.server_workers = workers
+worker_class = "app.workers.ProductionWorker"
+preload_app = True
+
+# Vendor pricing can hold a request for search_deadline_seconds; leave room
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    """The app is loaded and about to be forked: freeze what's been built."""
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Starting {workers} workers with {gc.get_freeze_count()} objects frozen before fork")
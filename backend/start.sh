@@ -2,4 +2,4 @@
 echo "PORT environment variable: $PORT"
 export PORT=${PORT:-8000}
 echo "Using PORT: $PORT"
-exec uvicorn app.main:app --host 0.0.0.0 --port $PORT
+exec gunicorn -c gunicorn.conf.py app.main:app
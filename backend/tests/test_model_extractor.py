@@ -0,0 +1,66 @@
+"""
+Golden test for the fused model-number regex (QueryParser._extract_model).
+
+Every query must give the model the original four-pattern cascade gives,
+and the model pinned here, so a change to MODEL_PATTERNS that moves both
+together still shows up in review.
+"""
+import pytest
+
+from app.services.parser import QueryParser
+from benchmarks.bench_model_extractor import EDGE_CASES, legacy_extract_model
+
+# (query, model) in the shape of searches typed at the counter
+GOLDEN = [
+    # Brand-prefixed models
+    ("Makita DTD152 carbon brush", "DTD152"),
+    ("dewalt dcf887 impact driver anvil", "DCF887"),
+    ("cp7748 anvil", "CP7748"),
+    ("dewalt dw292 anvil", "DW292"),
+    ("snap-on mg725 rotor", "MG725"),
+    ("mac tools aw7522 motor", "AW7522"),
+    ("paslode im325 piston", "IM325"),
+    ("cb440", "CB440"),
+    ("dewalt 20v dcf899 anvil", "DCF899"),
+    # Hyphenated models
+    ("ir-2135 trigger", "IR-2135"),
+    ("CP-7748 hammer pin", "CP-7748"),
+    ("makita cb-440 carbon brush", "CB-440"),
+    # A hyphenated model beats an earlier alphanumeric one
+    ("makita dtd152 cb-440", "CB-440"),
+    # Numeric models, with suffixes the pattern doesn't take
+    ("milwaukee 2767-20 o-ring", "2767"),
+    ("ingersoll rand 231c clutch", "231C"),
+    ("makita 6408 drill switch", "6408"),
+    ("2135", "2135"),
+    ("894a", "894A"),
+    ("ir 231 1/2 drive anvil", "231"),
+    ("1/2 impact 2135 vs 231c", "2135"),
+    ("milwaukee m18 2767", "2767"),
+    # Trailing part numbers: the model still wins
+    ("milwaukee 2804-20 chuck 48-66-1371", "2804"),
+    ("dewalt dcd996 switch n279310", "DCD996"),
+    ("makita bo5041 pad 197314-4", "BO5041"),
+    ("bosch gsb18v-490 chuck", "490"),
+    # No model
+    ("IR 2135TiMAX hammer case", None),
+    ("senco sns45 driver blade", None),
+    ("ridgid r86034 trigger switch", None),
+    ("porter cable 7424xp brush", None),
+    ("festool rotex 90", None),
+    ("n123456", None),
+    ("carbon brush", None),
+    ("", None),
+]
+
+
+@pytest.mark.parametrize("query, model", GOLDEN)
+def test_golden_models(query, model):
+    query = query.lower().strip()
+    assert QueryParser._extract_model(query) == model
+    assert legacy_extract_model(query) == model
+
+
+@pytest.mark.parametrize("query", EDGE_CASES)
+def test_matches_legacy_cascade_on_edge_cases(query):
+    assert QueryParser._extract_model(query) == legacy_extract_model(query)
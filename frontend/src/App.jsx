@@ -1,10 +1,10 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { Wrench } from 'lucide-react';
 import SearchBar from './components/SearchBar';
 import SearchResults from './components/SearchResults';
 import HistorySidebar from './components/HistorySidebar';
 import FavoritesList from './components/FavoritesList';
-import { searchParts } from './services/api';
+import { searchParts, streamPricing } from './services/api';
 
 function App() {
   const [searchResults, setSearchResults] = useState(null);
@@ -12,18 +12,33 @@ function App() {
   const [loading, setLoading] = useState(false);
   const [currentQuery, setCurrentQuery] = useState('');
   const [error, setError] = useState(null);
+  const stopPricingStream = useRef(null);
+
+  // Stop listening for a previous search's prices when leaving the page
+  useEffect(() => () => stopPricingStream.current?.(), []);
 
   const handleSearch = async (query) => {
     try {
       setLoading(true);
       setError(null);
       setCurrentQuery(query);
+      stopPricingStream.current?.();
+      stopPricingStream.current = null;
 
-      const data = await searchParts(query);
+      const data = await searchParts(query, null, true);
 
       setSearchResults(data.results);
       setParsedQuery(data.parsed);
 
+      // Fill in prices as each vendor finishes
+      if (data.search_id) {
+        stopPricingStream.current = streamPricing(data.search_id, (index, result) => {
+          setSearchResults((current) =>
+            current.map((existing, i) => (i === index ? result : existing))
+          );
+        });
+      }
+
     } catch (err) {
       console.error('Search failed:', err);
       setError('Search failed. Please try again.');
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Star, Trash2, Plus } from 'lucide-react';
-import { getFavorites, createFavorite, deleteFavorite, incrementOrderCount } from '../services/api';
+import { getAllFavorites, createFavorite, deleteFavorite, incrementOrderCount } from '../services/api';
 
 const FavoritesList = ({ onSelectFavorite, currentQuery }) => {
   const [favorites, setFavorites] = useState([]);
@@ -14,8 +14,7 @@ const FavoritesList = ({ onSelectFavorite, currentQuery }) => {
   const loadFavorites = async () => {
     try {
       setLoading(true);
-      const data = await getFavorites();
-      setFavorites(data.favorites || []);
+      setFavorites(await getAllFavorites());
     } catch (error) {
       console.error('Failed to load favorites:', error);
     } finally {
@@ -13,7 +13,7 @@ const SearchResults = ({ results, parsed }) => {
     // Try to open all tabs immediately
     let successCount = 0;
     results.forEach((result, index) => {
-      if (result.status === 'ready') {
+      if (result.status !== 'failed') {
         const newTab = window.open(result.url, `_blank_${index}`);
         if (newTab) successCount++;
       }
@@ -130,6 +130,13 @@ const VendorCard = ({ result }) => {
         )}
       </div>
 
+      {result.status === 'processing' && (
+        <div className="mb-4">
+          <p className="text-sm text-gray-600">Price Range</p>
+          <p className="text-sm text-gray-500">Checking prices{result.eta && ` (~${result.eta})`}…</p>
+        </div>
+      )}
+
       {result.pricing && (
         <div className="mb-4">
           <p className="text-sm text-gray-600">Price Range</p>
@@ -141,7 +148,7 @@ const VendorCard = ({ result }) => {
 
       <button
         onClick={handleOpenTab}
-        disabled={result.status !== 'ready'}
+        disabled={result.status === 'failed'}
         className="w-full flex items-center justify-center gap-2 px-4 py-2 bg-scarlet text-white font-medium rounded-lg hover:bg-scarlet-hover focus:outline-none focus:ring-2 focus:ring-scarlet focus:ring-offset-2 disabled:opacity-50 disabled:cursor-not-allowed transition-all"
       >
         <span>Open in New Tab</span>
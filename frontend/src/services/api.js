@@ -13,20 +13,55 @@ const api = axios.create({
 
 // ========== Search API ==========
 
-export const searchParts = async (query, vendors = null) => {
+export const searchParts = async (query, vendors = null, stream = false) => {
   const requestData = {
     query,
     ...(vendors && { vendors }),
+    ...(stream && { stream }),
   };
 
   const response = await api.post('/api/search', requestData);
   return response.data;
 };
 
+export const searchPartsBatch = async (queries, vendors = null) => {
+  const requestData = {
+    queries,
+    ...(vendors && { vendors }),
+  };
+
+  const response = await api.post('/api/search/batch', requestData);
+  return response.data;
+};
+
+// Listen for streamed pricing updates; returns a function that stops listening
+export const streamPricing = (searchId, onUpdate, onDone = () => {}) => {
+  const source = new EventSource(`${API_BASE_URL}/api/search/${searchId}/stream`);
+
+  source.addEventListener('pricing', (event) => {
+    const { index, result } = JSON.parse(event.data);
+    onUpdate(index, result);
+  });
+
+  source.addEventListener('done', () => {
+    source.close();
+    onDone();
+  });
+
+  source.onerror = () => {
+    source.close();
+    onDone();
+  };
+
+  return () => source.close();
+};
+
 // ========== Search History API ==========
 
-export const getSearchHistory = async (limit = 50) => {
-  const response = await api.get(`/api/history?limit=${limit}`);
+export const getSearchHistory = async (limit = 50, after = null) => {
+  const response = await api.get('/api/history', {
+    params: { limit, ...(after && { after }) },
+  });
   return response.data;
 };
 
@@ -37,11 +72,25 @@ export const clearSearchHistory = async () => {
 
 // ========== Favorites API ==========
 
-export const getFavorites = async () => {
-  const response = await api.get('/api/favorites');
+export const getFavorites = async (limit = 100, after = null) => {
+  const response = await api.get('/api/favorites', {
+    params: { limit, ...(after && { after }) },
+  });
   return response.data;
 };
 
+// Every favorite, following next_cursor until the last page
+export const getAllFavorites = async () => {
+  const favorites = [];
+  let after = null;
+  do {
+    const page = await getFavorites(500, after);
+    favorites.push(...(page.favorites || []));
+    after = page.next_cursor;
+  } while (after);
+  return favorites;
+};
+
 export const createFavorite = async (partDescription, searchQuery) => {
   const response = await api.post('/api/favorites', {
     part_description: partDescription,